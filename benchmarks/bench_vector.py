@@ -0,0 +1,99 @@
+"""
+Vector Allocation Microbenchmark
+================================
+
+Compares the old operator-style physics step (``position += velocity * dt``,
+``velocity *= FRICTION ** (dt * FPS)`` with immutable-style operators)
+against the in-place helpers now used by Ball.update and Player.update. Both
+apply friction per 1 / FPS of simulated time, as the game does. Reports
+Vector allocations and wall time per frame for one ball and 22 players,
+then the allocations of FootballGame.update with every body kept awake and
+with the game left to settle, along with the share of bodies asleep.
+
+Run from the repository root:
+
+    python benchmarks/bench_vector.py
+"""
+
+import os
+import sys
+import timeit
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import football
+from football import BALL_FRICTION, FPS, PLAYER_FRICTION, Vector
+
+NUM_BODIES = 2 * football.NUM_PLAYERS_PER_TEAM + 1
+FRAMES = 2000
+
+@contextmanager
+def count_vector_allocations():
+    """Counts Vector constructions made inside the block."""
+    counter = [0]
+    original_init = Vector.__init__
+    def counting_init(self, x=0.0, y=0.0):
+        counter[0] += 1
+        original_init(self, x, y)
+    Vector.__init__ = counting_init
+    try:
+        yield counter
+    finally:
+        Vector.__init__ = original_init
+
+def make_bodies():
+    return [(Vector(i, i), Vector(1.0, 2.0)) for i in range(NUM_BODIES)]
+
+def frame_operator_style(bodies, dt):
+    """The physics step as it was written before the in-place helpers."""
+    for i, (position, velocity) in enumerate(bodies):
+        # Friction is defined per 1 / FPS of simulated time, as in Ball.update
+        friction = (BALL_FRICTION if i == 0 else PLAYER_FRICTION) ** (dt * FPS)
+        velocity = velocity * friction
+        position = position + velocity * dt
+        bodies[i] = (position, velocity)
+
+def frame_inplace_style(bodies, dt):
+    """The physics step as Ball.update and Player.update now run it."""
+    for i, (position, velocity) in enumerate(bodies):
+        friction = (BALL_FRICTION if i == 0 else PLAYER_FRICTION) ** (dt * FPS)
+        velocity.scale_inplace(friction)
+        position.add_scaled(velocity, dt)
+
+def wake_all(bodies):
+    """Wakes every body and sets it moving, so none of them is skipped."""
+    for body in bodies:
+        body.velocity.set(1.0, 2.0)
+        body.wake()
+
+def main():
+    dt = 1.0 / FPS
+    print(f"{NUM_BODIES} bodies, {FRAMES} frames")
+    for name, frame in (("operators", frame_operator_style), ("in-place", frame_inplace_style)):
+        bodies = make_bodies()
+        with count_vector_allocations() as allocations:
+            for _ in range(FRAMES):
+                frame(bodies, dt)
+        bodies = make_bodies()
+        seconds = timeit.timeit(lambda: frame(bodies, dt), number=FRAMES)
+        print(f"{name:>10}: {allocations[0] / FRAMES:6.1f} Vector allocations/frame, "
+              f"{seconds / FRAMES * 1e6:7.2f} us/frame")
+
+    # Sleeping bodies are skipped, so measure with every body kept moving as
+    # well as with the game left alone, where most of the pitch settles
+    for label, keep_moving in (("all awake", True), ("as played", False)):
+        game = football.FootballGame()
+        asleep = 0
+        with count_vector_allocations() as allocations:
+            for _ in range(FRAMES):
+                if keep_moving:
+                    wake_all(game.bodies)
+                game.update(dt)
+                asleep += sum(body.asleep for body in game.bodies)
+        print(f"FootballGame.update ({label}): {allocations[0] / FRAMES:.1f} Vector "
+              f"allocations/frame, {asleep / (FRAMES * NUM_BODIES):.0%} of bodies asleep")
+    print(f"Vector instance size: {sys.getsizeof(Vector())} bytes (no __dict__)")
+
+if __name__ == "__main__":
+    main()
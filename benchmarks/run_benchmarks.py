@@ -0,0 +1,258 @@
+"""
+Football Simulation Benchmark Suite
+===================================
+
+Reproducible benchmarks for the football simulation, in three layers:
+
+* micro: Vector arithmetic and normalize, Ball.update and Player.update
+* mid:   Team.update (awake and with every player asleep) and
+         FootballGame.update (per backend)
+* e2e:   simulated seconds per wall-clock second for a headless match, and
+         commentary lines per second through CommentaryEngine
+
+Each benchmark is timed several times and the best run is kept, which is the
+least noisy estimate on a shared machine. Results are written as JSON together
+with machine metadata, and the compare command flags regressions against a
+saved baseline.
+
+Run from the repository root:
+
+    python benchmarks/run_benchmarks.py run --output baseline.json
+    python benchmarks/run_benchmarks.py run --output current.json
+    python benchmarks/run_benchmarks.py compare baseline.json current.json
+"""
+
+import argparse
+import datetime
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import time
+import timeit
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+import football
+import football_commentary_module as commentary
+from football import FPS, GAME_DURATION_SECONDS, Ball, FootballGame, Player, Team, Vector
+
+DEFAULT_REPEAT = 5
+DEFAULT_THRESHOLD = 0.10
+
+# ==============================================================================
+# SECTION 1: Timing Helpers
+# ==============================================================================
+
+def time_per_call(func, repeat):
+    """Returns the best observed time of one call to func, in seconds."""
+    timer = timeit.Timer(func)
+    number, _ = timer.autorange()
+    return min(timer.repeat(repeat=repeat, number=number)) / number
+
+def result(name, layer, value, unit, higher_is_better):
+    return {
+        "name": name,
+        "layer": layer,
+        "value": value,
+        "unit": unit,
+        "higher_is_better": higher_is_better,
+    }
+
+def per_call(name, layer, func, repeat):
+    return result(name, layer, time_per_call(func, repeat) * 1e6, "us/call", False)
+
+def per_call_awake(name, layer, func, wake, repeat):
+    """Like per_call, but runs wake() before every call and subtracts its cost.
+
+    Bodies fall asleep once friction has stopped them, and are then
+    skipped, so without this the later calls would time skipped work.
+    """
+    def woken():
+        wake()
+        func()
+    seconds = time_per_call(woken, repeat) - time_per_call(wake, repeat)
+    return result(name, layer, max(0.0, seconds) * 1e6, "us/call", False)
+
+def waker(bodies, vx, vy):
+    """Returns a function that wakes bodies and sets them all moving at (vx, vy)."""
+    def wake():
+        for body in bodies:
+            body.velocity.set(vx, vy)
+            body.wake()
+    return wake
+
+# ==============================================================================
+# SECTION 2: Benchmarks
+# ==============================================================================
+
+def micro_benchmarks(repeat):
+    dt = 1.0 / FPS
+    a, b = Vector(3.0, 4.0), Vector(1.5, -2.5)
+    ball = Ball(Vector(400.0, 300.0))
+    ball.velocity.set(120.0, 40.0)
+    player = Player(1, Vector(100.0, 100.0))
+    player.velocity.set(3.0, 1.0)
+    return [
+        per_call("vector.add", "micro", lambda: a + b, repeat),
+        per_call("vector.mul", "micro", lambda: a * 0.5, repeat),
+        per_call("vector.normalize", "micro", a.normalize, repeat),
+        per_call("vector.add_scaled", "micro", lambda: a.add_scaled(b, 0.0), repeat),
+        per_call_awake("ball.update", "micro", lambda: ball.update(dt),
+                       waker([ball], 120.0, 40.0), repeat),
+        per_call_awake("player.update", "micro", lambda: player.update(dt),
+                       waker([player], 3.0, 1.0), repeat),
+    ]
+
+def mid_benchmarks(repeat):
+    dt = 1.0 / FPS
+    team = Team(1, football.TEAM_A_COLOR)
+    results = [per_call_awake("team.update", "mid", lambda: team.update(dt),
+                              waker(team.players, 3.0, 1.0), repeat)]
+    waker(team.players, 0.0, 0.0)()
+    for _ in range(int(football.SLEEP_DELAY_SECONDS / dt) + 2):
+        team.update(dt)
+    results.append(per_call("team.update[asleep]", "mid", lambda: team.update(dt), repeat))
+    backends = ["objects"] + (["numpy"] if football.np is not None else [])
+    for backend in backends:
+        game = FootballGame(backend, seed=0)
+        results.append(per_call(f"game.update[{backend}]", "mid",
+                                lambda: game.update(dt), repeat))
+    return results
+
+def match_benchmark(repeat, sim_seconds):
+    """Simulated seconds per wall-clock second for a headless match."""
+    best = 0.0
+    for seed in range(repeat):
+        game = FootballGame(seed=seed)
+        # Start the clock close to full time so only sim_seconds are played.
+        game.timer = GAME_DURATION_SECONDS - sim_seconds
+        start = time.perf_counter()
+        game.run(realtime=False, render_every=None)
+        best = max(best, sim_seconds / (time.perf_counter() - start))
+    return result("match.headless", "e2e", best, "sim_s/wall_s", True)
+
+def commentary_benchmark(repeat):
+    """Commentary lines per second through CommentaryEngine into an in-memory sink.
+
+    Each timed call emits a burst of lines and waits for the writer thread
+    to finish writing them.
+    """
+    engine = commentary.CommentaryEngine(sinks=[commentary.MemorySink(max_lines=1000)])
+    events = [
+        commentary.CommentaryEvent("kickoff", "A"),
+        commentary.CommentaryEvent("pass", "A", player_id=1, other_params={"target_player": 5}),
+        commentary.CommentaryEvent("tackle", "B", player_id=3),
+        commentary.CommentaryEvent("goal", "B", player_id=8),
+        commentary.CommentaryEvent("corner_kick", "A"),
+    ] * 200
+
+    def emit_all():
+        for event in events:
+            engine.generate_commentary_for_event(event)
+        engine.flush()
+
+    with engine:
+        seconds = time_per_call(emit_all, repeat)
+    return result("commentary.engine", "e2e", len(events) / seconds, "lines/s", True)
+
+def run_all(repeat, sim_seconds):
+    results = micro_benchmarks(repeat) + mid_benchmarks(repeat)
+    results.append(match_benchmark(max(1, repeat // 2), sim_seconds))
+    results.append(commentary_benchmark(repeat))
+    return results
+
+# ==============================================================================
+# SECTION 3: Metadata, Reporting and Comparison
+# ==============================================================================
+
+def machine_metadata():
+    try:
+        commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=REPO_ROOT,
+                                capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "git_commit": commit,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor(),
+        "cpu_count": os.cpu_count(),
+        "numpy": football.np.__version__ if football.np is not None else None,
+    }
+
+def print_results(results):
+    for entry in results:
+        print(f"{entry['layer']:>6}  {entry['name']:<24} {entry['value']:>14.3f} {entry['unit']}")
+
+def compare(baseline, current, threshold):
+    """Returns the benchmarks in current that are slower than baseline by more than threshold."""
+    baseline_by_name = {entry["name"]: entry for entry in baseline["results"]}
+    regressions = []
+    for entry in current["results"]:
+        base = baseline_by_name.get(entry["name"])
+        if base is None or base["unit"] != entry["unit"]:
+            continue
+        if entry["higher_is_better"]:
+            slower, faster = base["value"], entry["value"]
+        else:
+            slower, faster = entry["value"], base["value"]
+        if faster:
+            slowdown = slower / faster - 1.0
+        else:
+            # A zero value cannot be compared as a ratio; only a move away from it counts
+            slowdown = math.inf if slower else 0.0
+        flag = "REGRESSION" if slowdown > threshold else ""
+        if not base["value"] or not entry["value"]:
+            flag = (flag + " (zero value)").strip()
+        print(f"{entry['name']:<24} {base['value']:>14.3f} -> {entry['value']:>14.3f} "
+              f"{entry['unit']:<14} {slowdown:+7.1%} {flag}")
+        if slowdown > threshold:
+            regressions.append(entry["name"])
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="run the benchmarks")
+    run_parser.add_argument("--output", help="write the JSON report to this file")
+    run_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT)
+    run_parser.add_argument("--sim-seconds", type=float, default=30.0,
+                            help="simulated seconds per headless match run")
+
+    compare_parser = commands.add_parser("compare", help="compare two JSON reports")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                help="relative slowdown that counts as a regression")
+
+    args = parser.parse_args(argv)
+    if args.command == "run":
+        report = {"metadata": machine_metadata(),
+                  "results": run_all(args.repeat, args.sim_seconds)}
+        print_results(report["results"])
+        if args.output:
+            with open(args.output, "w") as f:
+                json.dump(report, f, indent=2)
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    if regressions:
+        print(f"{len(regressions)} regression(s): {', '.join(regressions)}")
+        return 1
+    print("No regressions.")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
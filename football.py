@@ -17,9 +17,19 @@ Developed as a fun side project to explore game development principles
 without a heavy graphics engine.
 """
 
+import json
 import math
+import os
 import random
+import struct
 import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is only needed for the "numpy" state backend
+    np = None
 
 # ==============================================================================
 # SECTION 1: Game Configuration and Constants
@@ -32,30 +42,141 @@ FPS = 60
 SIMULATION_STEPS_PER_FRAME = 10
 GAME_DURATION_SECONDS = 300
 
+# Friction factors are applied once per 1 / FPS of simulated time, so physics
+# substeps (SIMULATION_STEPS_PER_FRAME) scale them to their share of a frame.
+
 # Player and Team Constants
 NUM_PLAYERS_PER_TEAM = 11
 PLAYER_RADIUS = 10
 PLAYER_MAX_SPEED = 5.0
 PLAYER_ACCELERATION = 0.5
 PLAYER_FRICTION = 0.95
+PLAYER_WEIGHT = 70.0
 TEAM_A_COLOR = (255, 0, 0)
 TEAM_B_COLOR = (0, 0, 255)
 
+# AI Scheduling
+AI_DECISIONS_PER_SECOND = 10
+AI_PRIORITY_RADIUS = 150
+AI_PRIORITY_FACTOR = 3
+AI_MAX_DECISIONS_PER_TICK = 4
+
 # Ball Constants
 BALL_RADIUS = 7
 BALL_WEIGHT = 0.5
 BALL_FRICTION = 0.98
+KICKOFF_SPEED = 600.0
+
+# Goals are centred on the left (x = 0) and right (x = GAME_WIDTH) touchlines.
+# Team A attacks the right-hand goal, team B the left-hand goal.
+GOAL_WIDTH = 120
 
 # Physics and Collision
 COEFFICIENT_OF_RESTITUTION = 0.7
 COLLISION_BUFFER = 0.1
+SLEEP_SPEED_THRESHOLD = 0.05  # Bodies slower than this are put to sleep...
+SLEEP_DELAY_SECONDS = 0.05    # ...once they have stayed that slow for this long
+
+# Adaptive Timestep
+ADAPTIVE_STEP_DISTANCE = BALL_RADIUS  # Furthest the ball may travel in one adaptive step
+ADAPTIVE_LINE_MARGIN = 2 * PLAYER_RADIUS  # Closer than this to a line, steps stay fine
+
+# Formations, as the number of players in each outfield line from defence to
+# attack; the goalie is added in front of the team's own goal.
+FORMATIONS = {
+    "4-4-2": (4, 4, 2),
+    "4-3-3": (4, 3, 3),
+    "3-5-2": (3, 5, 2),
+    "5-3-2": (5, 3, 2),
+    "4-2-3-1": (4, 2, 3, 1),
+}
+DEFAULT_FORMATION = "4-4-2"
+
+# Game States, Player Roles and Match Events
+GAME_STATES = ("KICKOFF", "IN_PLAY", "GOAL", "OUT_OF_BOUNDS")
+PLAYER_ROLES = ("FORWARD", "DEFENDER", "MIDFIELDER", "GOALIE")
+MATCH_EVENTS = ("kickoff", "goal", "out_of_bounds", "collision")
+
+# Event Bus
+BUS_EVENTS = ("kickoff", "pass", "tackle", "goal", "out_of_bounds")
+EVENT_BUS_CAPACITY = 4096  # Slots in the ring buffer; rounded up to a power of two
+
+# Snapshots
+SNAPSHOT_MAGIC = b"FBSN"
+SNAPSHOT_VERSION = 7
 
 # ==============================================================================
 # SECTION 2: Core Game Classes
 # ==============================================================================
 
+def classify_ball_position(x, y):
+    """Applies the scoring rules to a ball position.
+
+    Returns (goal_a, goal_b, out): whether team A or team B has scored and
+    whether the ball has left the pitch at all. Only element-wise operators
+    are used, so x and y may also be NumPy arrays of ball positions.
+    """
+    in_goal_mouth = abs(y - GAME_HEIGHT / 2) <= GOAL_WIDTH / 2
+    goal_a = (x > GAME_WIDTH) & in_goal_mouth
+    goal_b = (x < 0) & in_goal_mouth
+    out = (x < 0) | (x > GAME_WIDTH) | (y < 0) | (y > GAME_HEIGHT)
+    return goal_a, goal_b, out
+
+def classify_ball_path(x0, y0, x1, y1):
+    """Swept version of classify_ball_position for a ball moving from (x0, y0) to (x1, y1).
+
+    The ball is judged at the point where its path first leaves the pitch
+    rather than where it ends up, so a ball that crosses a touchline cannot
+    be counted as a goal, and one that crosses the goal line wide of the
+    posts cannot end up "inside" the goal mouth, however long the step. A
+    path that starts off the pitch is judged by its end point.
+    """
+    goal_a, goal_b, out = classify_ball_position(x1, y1)
+    if not out or not (0 <= x0 <= GAME_WIDTH and 0 <= y0 <= GAME_HEIGHT):
+        return goal_a, goal_b, out
+    # Fraction of the path at which it crosses the goal lines and the touchlines
+    dx, dy = x1 - x0, y1 - y0
+    if x1 > GAME_WIDTH or x1 < 0:
+        t_goal_line = ((GAME_WIDTH if x1 > GAME_WIDTH else 0) - x0) / dx
+    else:
+        t_goal_line = math.inf
+    if y1 > GAME_HEIGHT or y1 < 0:
+        t_touchline = ((GAME_HEIGHT if y1 > GAME_HEIGHT else 0) - y0) / dy
+    else:
+        t_touchline = math.inf
+    if t_touchline < t_goal_line:
+        return False, False, True
+    in_goal_mouth = abs(y0 + dy * t_goal_line - GAME_HEIGHT / 2) <= GOAL_WIDTH / 2
+    return in_goal_mouth and x1 > GAME_WIDTH, in_goal_mouth and x1 < 0, True
+
+def _formation_layout(lines):
+    """Returns (x, y, role) kickoff spots for a team defending the left-hand goal.
+
+    Outfield lines are spread across the team's own half, staying outside
+    the reach of the ball on the centre spot.
+    """
+    layout = [(3 * PLAYER_RADIUS, GAME_HEIGHT / 2, "GOALIE")]
+    last = len(lines) - 1
+    for k, count in enumerate(lines):
+        x = GAME_WIDTH * (0.12 + 0.30 * k / max(1, last))
+        role = "DEFENDER" if k == 0 else "FORWARD" if k == last else "MIDFIELDER"
+        layout.extend((x, GAME_HEIGHT * (j + 1) / (count + 1), role) for j in range(count))
+    if len(layout) != NUM_PLAYERS_PER_TEAM:
+        raise ValueError(f"Formation {lines} does not field {NUM_PLAYERS_PER_TEAM} players")
+    return tuple(layout)
+
+# Kickoff spots per formation, worked out once; team B mirrors them.
+FORMATION_LAYOUTS = {name: _formation_layout(lines) for name, lines in FORMATIONS.items()}
+
 class Vector:
-    """A simple 2D vector class for position, velocity, and acceleration."""
+    """A simple 2D vector class for position, velocity, and acceleration.
+
+    The binary operators return new vectors. The in-place operators and the
+    fused helpers (add_scaled, scale_inplace, set) mutate the vector instead,
+    which keeps the per-frame physics free of temporary allocations.
+    """
+    __slots__ = ("x", "y")
+
     def __init__(self, x=0.0, y=0.0):
         self.x = x
         self.y = y
@@ -69,6 +190,42 @@ class Vector:
     def __mul__(self, scalar):
         return Vector(self.x * scalar, self.y * scalar)
 
+    def __iadd__(self, other):
+        self.x += other.x
+        self.y += other.y
+        return self
+
+    def __isub__(self, other):
+        self.x -= other.x
+        self.y -= other.y
+        return self
+
+    def __imul__(self, scalar):
+        self.x *= scalar
+        self.y *= scalar
+        return self
+
+    def add_scaled(self, other, k):
+        """Adds other * k to this vector in place."""
+        self.x += other.x * k
+        self.y += other.y * k
+        return self
+
+    def scale_inplace(self, k):
+        """Multiplies this vector by k in place."""
+        self.x *= k
+        self.y *= k
+        return self
+
+    def set(self, x, y):
+        """Overwrites both components in place."""
+        self.x = x
+        self.y = y
+        return self
+
+    def copy(self):
+        return Vector(self.x, self.y)
+
     def magnitude(self):
         return math.sqrt(self.x**2 + self.y**2)
 
@@ -84,12 +241,37 @@ class Vector:
 # ... (Lines 72 - 1200 will be filled with more classes and functions) ...
 
 class GameObject:
-    """Base class for all game objects (players, ball, etc.)."""
+    """Base class for all game objects (players, ball, etc.).
+
+    A body that stays slower than SLEEP_SPEED_THRESHOLD for SLEEP_DELAY_SECONDS
+    of simulated time is put to sleep: its velocity is zeroed, its owner
+    skips its updates and pairs of sleeping bodies skip collision tests,
+    until something wakes it. The delay lets contacts settle before bodies
+    sleep, and as it is measured in time it does not depend on the step size.
+    """
     def __init__(self, position, velocity, radius):
+        self.asleep = False
+        self.slow_time = 0.0
         self.position = position
         self.velocity = velocity
         self.radius = radius
 
+    def wake(self):
+        self.asleep = False
+        self.slow_time = 0.0
+
+    def _try_sleep(self, dt):
+        """Puts the body to sleep if it has effectively stopped moving."""
+        velocity = self.velocity
+        if velocity.x * velocity.x + velocity.y * velocity.y >= SLEEP_SPEED_THRESHOLD ** 2:
+            self.slow_time = 0.0
+            return
+        self.slow_time += dt
+        # Half a step of slack, so the delay ends on the nearest whole step
+        if self.slow_time + 0.5 * dt >= SLEEP_DELAY_SECONDS:
+            velocity.set(0.0, 0.0)
+            self.asleep = True
+
 class Ball(GameObject):
     """Represents the football in the game."""
     def __init__(self, position):
@@ -98,95 +280,1090 @@ class Ball(GameObject):
 
     def update(self, dt):
         """Placeholder for ball physics and movement."""
-        self.velocity *= BALL_FRICTION
-        self.position += self.velocity * dt
+        self.velocity.scale_inplace(BALL_FRICTION ** (dt * FPS))
+        self.position.add_scaled(self.velocity, dt)
+        self._try_sleep(dt)
+
+    # The trajectory queries below solve update() analytically. After n steps
+    # of length h with per-step friction f = BALL_FRICTION ** (h * FPS) the
+    # ball has travelled v0 * h * f * (1 - f**n) / (1 - f), along a straight
+    # line. They ignore collisions and the pitch boundaries, and are exact
+    # for whole numbers of steps of the given length.
+
+    @staticmethod
+    def _step_friction(step):
+        if step is None:
+            step = 1.0 / (FPS * SIMULATION_STEPS_PER_FRAME)
+        return step, BALL_FRICTION ** (step * FPS)
+
+    def _distance_after(self, steps, step, friction):
+        """Distance per unit of initial speed travelled after the given number of steps."""
+        if friction == 1.0:
+            return step * steps
+        return step * friction * (1.0 - friction ** steps) / (1.0 - friction)
+
+    def predict_position(self, t, step=None):
+        """Returns where the ball will be after t seconds, without stepping.
+
+        step is the physics step length the game runs at; it defaults to one
+        substep of a SIMULATION_STEPS_PER_FRAME frame.
+        """
+        step, friction = self._step_friction(step)
+        scale = self._distance_after(t / step, step, friction)
+        return Vector(self.position.x + self.velocity.x * scale,
+                      self.position.y + self.velocity.y * scale)
+
+    def rest_position(self, step=None):
+        """Returns where the ball will come to rest if nothing touches it."""
+        step, friction = self._step_friction(step)
+        if friction >= 1.0 and (self.velocity.x or self.velocity.y):
+            return None  # Without friction the ball never stops
+        scale = step * friction / (1.0 - friction) if friction < 1.0 else 0.0
+        return Vector(self.position.x + self.velocity.x * scale,
+                      self.position.y + self.velocity.y * scale)
+
+    def time_to_reach(self, point, tolerance=None, step=None):
+        """Returns how many seconds until the ball passes point, or None.
+
+        The ball travels in a straight line, so "passing" means reaching the
+        point's projection onto that line. None is returned if the point is
+        behind the ball, beyond its rest position, or (when tolerance is
+        given) further than tolerance from the line.
+        """
+        step, friction = self._step_friction(step)
+        dx = point.x - self.position.x
+        dy = point.y - self.position.y
+        speed = self.velocity.magnitude()
+        if speed == 0:
+            return 0.0 if dx == 0 and dy == 0 else None
+        along = (dx * self.velocity.x + dy * self.velocity.y) / speed
+        if along < 0:
+            return None
+        if tolerance is not None:
+            across = abs(dx * self.velocity.y - dy * self.velocity.x) / speed
+            if across > tolerance:
+                return None
+        if friction == 1.0:
+            return along / speed
+        remaining = 1.0 - along * (1.0 - friction) / (speed * step * friction)
+        if remaining <= 0:
+            return None
+        return math.log(remaining) / math.log(friction) * step
 
 class Player(GameObject):
     """Represents a single football player."""
+    _ai_target = None
+
     def __init__(self, team_id, position):
         super().__init__(position, Vector(), PLAYER_RADIUS)
+        self.weight = PLAYER_WEIGHT
         self.team_id = team_id
         self.is_controlled = False
         self.ai_target = None
+        self.ai_scheduled = False  # Set when an AIScheduler makes the decisions
         self.stamina = 100.0
         self.role = "MIDFIELDER" # Forward, Defender, Midfielder, Goalie
 
+    @property
+    def ai_target(self):
+        return self._ai_target
+
+    @ai_target.setter
+    def ai_target(self, value):
+        current = self._ai_target
+        self._ai_target = value
+        if value is not None and (current is None or current.x != value.x or current.y != value.y):
+            self.wake()
+
     def update(self, dt):
         """Placeholder for player movement, AI, and stamina."""
-        if not self.is_controlled:
+        if not self.is_controlled and not self.ai_scheduled:
             self._update_ai_movement()
+        self._move(dt)
+
+    def _move(self, dt):
+        """Steers, applies friction and moves the player by one step."""
+        steering = False
+        if not self.is_controlled:
+            steering = self._steer_towards_target(dt)
         self._apply_friction(dt)
         self._update_stamina(dt)
-        self.position += self.velocity * dt
+        self.position.add_scaled(self.velocity, dt)
+        if not steering and not self.is_controlled:
+            self._try_sleep(dt)
 
     def _update_ai_movement(self):
         """Simulates AI-driven player movement towards a target."""
         # This function would contain complex AI logic
         pass
 
+    def _steer_towards_target(self, dt):
+        """Accelerates towards the cached ai_target, up to PLAYER_MAX_SPEED.
+
+        Returns True if the player is still heading for its target.
+        """
+        target = self.ai_target
+        if target is None:
+            return False
+        position, velocity = self.position, self.velocity
+        dx = target.x - position.x
+        dy = target.y - position.y
+        distance = math.sqrt(dx * dx + dy * dy)
+        if distance <= PLAYER_RADIUS:
+            return False  # Close enough; friction brings the player to rest
+        k = PLAYER_ACCELERATION * dt * FPS / distance
+        velocity.set(velocity.x + dx * k, velocity.y + dy * k)
+        speed = velocity.magnitude()
+        if speed > PLAYER_MAX_SPEED:
+            velocity.scale_inplace(PLAYER_MAX_SPEED / speed)
+        return True
+
     def _apply_friction(self, dt):
         """Reduces player velocity over time."""
-        self.velocity *= PLAYER_FRICTION
+        self.velocity.scale_inplace(PLAYER_FRICTION ** (dt * FPS))
 
     def _update_stamina(self, dt):
         """Manages the player's stamina."""
         pass
 
+class VectorView(Vector):
+    """A Vector whose components live in a row of a NumPy array."""
+    __slots__ = ("_row",)
+
+    def __init__(self, data, row):
+        self._row = data[row]  # A view, so writes land in data
+
+    @property
+    def x(self):
+        return self._row.item(0)
+
+    @x.setter
+    def x(self, value):
+        self._row[0] = value
+
+    @property
+    def y(self):
+        return self._row.item(1)
+
+    @y.setter
+    def y(self, value):
+        self._row[1] = value
+
+class ArrayPlayer(Player):
+    """A Player whose position, velocity and stamina are stored in PitchArrays."""
+    def __init__(self, team_id, position, pitch, row):
+        self.pitch = pitch
+        self.row = row
+        self._position = VectorView(pitch.positions, row)
+        self._velocity = VectorView(pitch.velocities, row)
+        super().__init__(team_id, position)
+
+    @property
+    def position(self):
+        return self._position
+
+    @position.setter
+    def position(self, value):
+        self.pitch.positions[self.row] = (value.x, value.y)
+
+    @property
+    def velocity(self):
+        return self._velocity
+
+    @velocity.setter
+    def velocity(self, value):
+        self.pitch.velocities[self.row] = (value.x, value.y)
+
+    @property
+    def stamina(self):
+        return float(self.pitch.stamina[self.row])
+
+    @stamina.setter
+    def stamina(self, value):
+        self.pitch.stamina[self.row] = value
+
+    @property
+    def is_controlled(self):
+        return bool(self.pitch.controlled[self.row])
+
+    @is_controlled.setter
+    def is_controlled(self, value):
+        self.pitch.controlled[self.row] = value
+
+    @property
+    def ai_target(self):
+        if not self.pitch.has_target[self.row]:
+            return None
+        return Vector(*self.pitch.targets[self.row].tolist())
+
+    @ai_target.setter
+    def ai_target(self, value):
+        pitch, row = self.pitch, self.row
+        if value is None:
+            pitch.has_target[row] = False
+        elif not pitch.has_target[row] or pitch.targets[row].tolist() != [value.x, value.y]:
+            pitch.targets[row] = (value.x, value.y)
+            pitch.has_target[row] = True
+            self.wake()
+
+    @property
+    def asleep(self):
+        return bool(self.pitch.asleep[self.row])
+
+    @asleep.setter
+    def asleep(self, value):
+        self.pitch.asleep[self.row] = value
+
+    @property
+    def slow_time(self):
+        return self.pitch.slow_time.item(self.row)
+
+    @slow_time.setter
+    def slow_time(self, value):
+        self.pitch.slow_time[self.row] = value
+
+class PitchArrays:
+    """Structure-of-arrays state for every player on the pitch.
+
+    Positions and velocities are (N, 2) float arrays and stamina is an (N,)
+    array, so steering, friction, integration and stamina run as one
+    vectorized step per frame instead of one Python call per player. AI
+    targets and the controlled flags are kept in arrays for the same reason.
+    """
+    def __init__(self, num_players=2 * NUM_PLAYERS_PER_TEAM):
+        if np is None:
+            raise ImportError("The numpy state backend requires NumPy to be installed.")
+        self.positions = np.zeros((num_players, 2))
+        self.velocities = np.zeros((num_players, 2))
+        self.stamina = np.full(num_players, 100.0)
+        self.targets = np.zeros((num_players, 2))
+        self.has_target = np.zeros(num_players, dtype=bool)
+        self.controlled = np.zeros(num_players, dtype=bool)
+        self.asleep = np.zeros(num_players, dtype=bool)
+        self.slow_time = np.zeros(num_players)
+        self.updates_skipped = 0
+        self.players = []
+        self.ai_scheduled = False  # Set when an AIScheduler makes the decisions
+        self._scratch = np.empty((num_players, 2))
+
+    def update(self, dt):
+        """Updates all players on the pitch in one pass.
+
+        The vectorized step covers the whole pitch, so it is skipped, and
+        every player counted in updates_skipped, only when all of them are
+        asleep. Sleeping players have zero velocity, so while others are
+        awake the step leaves them where they are.
+        """
+        if not self.ai_scheduled:
+            for player in self.players:
+                if not player.is_controlled:
+                    player._update_ai_movement()
+        if self.asleep.all() and not self.controlled.any():
+            self.updates_skipped += len(self.asleep)
+            return
+        steering = self._steer_towards_targets(dt)
+        self.velocities *= PLAYER_FRICTION ** (dt * FPS)
+        self._update_stamina(dt)
+        np.multiply(self.velocities, dt, out=self._scratch)
+        self.positions += self._scratch
+        self._try_sleep(steering, dt)
+
+    def _try_sleep(self, steering, dt):
+        """Vectorized GameObject._try_sleep for players that are not steering."""
+        speed_sq = np.einsum("nd,nd->n", self.velocities, self.velocities)
+        slow = (speed_sq < SLEEP_SPEED_THRESHOLD ** 2) & ~steering & ~self.controlled
+        self.slow_time[~slow] = 0.0
+        self.slow_time[slow & ~self.asleep] += dt
+        settling = slow & (self.slow_time + 0.5 * dt >= SLEEP_DELAY_SECONDS)
+        self.velocities[settling] = 0.0
+        self.asleep |= settling
+
+    def _steer_towards_targets(self, dt):
+        """Vectorized Player._steer_towards_target for the whole pitch.
+
+        Returns the mask of players still heading for their targets.
+        """
+        delta = np.subtract(self.targets, self.positions, out=self._scratch)
+        distance = np.hypot(delta[:, 0], delta[:, 1])
+        steering = self.has_target & ~self.controlled & (distance > PLAYER_RADIUS)
+        if not steering.any():
+            return steering
+        scale = np.zeros_like(distance)
+        scale[steering] = PLAYER_ACCELERATION * dt * FPS / distance[steering]
+        self.velocities += delta * scale[:, None]
+        speed = np.hypot(self.velocities[:, 0], self.velocities[:, 1])
+        too_fast = steering & (speed > PLAYER_MAX_SPEED)
+        self.velocities[too_fast] *= (PLAYER_MAX_SPEED / speed[too_fast])[:, None]
+        return steering
+
+    def _update_stamina(self, dt):
+        """Manages stamina for every player at once."""
+        # Mirrors Player._update_stamina, which has no stamina model yet.
+        pass
+
 class Team:
     """Represents a football team."""
-    def __init__(self, team_id, color):
+    def __init__(self, team_id, color, pitch=None, first_row=0):
         self.team_id = team_id
-        self.players = [Player(team_id, Vector()) for _ in range(NUM_PLAYERS_PER_TEAM)]
+        if pitch is None:
+            self.players = [Player(team_id, Vector()) for _ in range(NUM_PLAYERS_PER_TEAM)]
+        else:
+            self.players = [ArrayPlayer(team_id, Vector(), pitch, first_row + i)
+                            for i in range(NUM_PLAYERS_PER_TEAM)]
+            pitch.players.extend(self.players)
         self.score = 0
         self.color = color
+        self.updates_skipped = 0
+
+    def set_formation(self, formation=DEFAULT_FORMATION, mirrored=False):
+        """Puts every player on their kickoff spot for formation, at rest.
+
+        The spots come from FORMATION_LAYOUTS and are written into the
+        existing player objects. mirrored places the team in the right-hand
+        half, defending the right-hand goal.
+        """
+        for player, (x, y, role) in zip(self.players, FORMATION_LAYOUTS[formation]):
+            player.position.set(GAME_WIDTH - x if mirrored else x, y)
+            player.velocity.set(0.0, 0.0)
+            player.role = role
 
     def update(self, dt):
-        """Updates all players on the team."""
+        """Updates all players on the team, skipping the movement of sleeping ones."""
         for player in self.players:
-            player.update(dt)
+            if not player.asleep or player.is_controlled:
+                player.update(dt)
+                continue
+            # Sleeping players still make their own AI decisions, as in PitchArrays
+            if not player.ai_scheduled:
+                player._update_ai_movement()  # A new ai_target wakes the player
+            if player.asleep:
+                self.updates_skipped += 1
+            else:
+                player._move(dt)
+
+class AIScheduler:
+    """Runs player AI decisions at a lower, staggered rate than the physics.
+
+    Each player decides rate times per simulated second, and players start
+    at evenly spread phase offsets so decisions are spread across ticks
+    instead of all landing on the same one. Players within priority_radius
+    of the ball decide priority_factor times as often. At most max_per_tick
+    decisions run per tick; when more are due, the players nearest the ball
+    go first and the rest are deferred to the next tick. Between decisions
+    players keep steering towards their cached ai_target.
+    """
+    def __init__(self, players, rate=AI_DECISIONS_PER_SECOND,
+                 priority_radius=AI_PRIORITY_RADIUS, priority_factor=AI_PRIORITY_FACTOR,
+                 max_per_tick=AI_MAX_DECISIONS_PER_TICK):
+        self.players = list(players)
+        self.interval = 1.0 / rate
+        self.priority_radius = priority_radius
+        self.priority_factor = priority_factor
+        self.max_per_tick = max_per_tick
+        self.reset()
+        for player in self.players:
+            player.ai_scheduled = True
+
+    def reset(self):
+        """Restarts the clock and the staggered decision schedule."""
+        self.clock = 0.0
+        count = len(self.players)
+        self.next_decision = [i * self.interval / count for i in range(count)]
+        self.decisions = 0
+        self.deferred = 0
+
+    def tick(self, ball, dt):
+        """Advances the scheduler clock and runs the decisions that are due."""
+        self.clock += dt
+        now = self.clock
+        players = self.players
+        due = [i for i, t in enumerate(self.next_decision)
+               if t <= now and not players[i].is_controlled]
+        if not due:
+            return
+        bx, by = ball.position.x, ball.position.y
+        distance_sq = {}
+        for i in due:
+            position = players[i].position
+            distance_sq[i] = (position.x - bx) ** 2 + (position.y - by) ** 2
+        if len(due) > self.max_per_tick:
+            due.sort(key=distance_sq.__getitem__)
+            self.deferred += len(due) - self.max_per_tick
+            due = due[:self.max_per_tick]
+        priority_sq = self.priority_radius * self.priority_radius
+        for i in due:
+            players[i]._update_ai_movement()
+            interval = self.interval
+            if distance_sq[i] <= priority_sq:
+                interval /= self.priority_factor
+            self.next_decision[i] = now + interval
+        self.decisions += len(due)
+
+class SpatialHash:
+    """Uniform grid broad-phase for collision detection over the pitch.
+
+    Bodies are bucketed into square cells at least one body diameter wide, so
+    only bodies in the same or neighbouring cells can touch. pairs_tested
+    and pairs_skipped count how many pair tests were made and how many the
+    all-pairs check would have added; pairs_sleeping counts the neighbouring
+    pairs left out because both bodies were asleep. The counters add up
+    over every call since the last begin_frame, so FootballGame reports
+    them per frame.
+    """
+    # Forward half of the 3x3 neighbourhood, so each pair of cells is visited once.
+    NEIGHBOUR_OFFSETS = ((1, -1), (1, 0), (1, 1), (0, 1))
+
+    def __init__(self, cell_size, width=GAME_WIDTH, height=GAME_HEIGHT):
+        self.cell_size = cell_size
+        self.cols = max(1, math.ceil(width / cell_size))
+        self.rows = max(1, math.ceil(height / cell_size))
+        self.pairs_tested = 0
+        self.pairs_skipped = 0
+        self.pairs_sleeping = 0
+
+    def begin_frame(self):
+        """Zeroes the pair counters at the start of a frame."""
+        self.pairs_tested = 0
+        self.pairs_skipped = 0
+        self.pairs_sleeping = 0
+
+    def _cell(self, position):
+        """Returns the grid cell for a position, clamped onto the pitch."""
+        cx = min(max(int(position.x // self.cell_size), 0), self.cols - 1)
+        cy = min(max(int(position.y // self.cell_size), 0), self.rows - 1)
+        return cx, cy
+
+    def candidate_pairs(self, bodies):
+        """Returns the pairs of bodies that share or neighbour a grid cell."""
+        cells = {}
+        for body in bodies:
+            cells.setdefault(self._cell(body.position), []).append(body)
+
+        pairs = []
+        sleeping = 0
+        for (cx, cy), members in cells.items():
+            count = len(members)
+            for i in range(count):
+                a = members[i]
+                for j in range(i + 1, count):
+                    b = members[j]
+                    if a.asleep and b.asleep:
+                        sleeping += 1
+                    else:
+                        pairs.append((a, b))
+            for dx, dy in self.NEIGHBOUR_OFFSETS:
+                neighbours = cells.get((cx + dx, cy + dy))
+                if neighbours:
+                    for a in members:
+                        for b in neighbours:
+                            if a.asleep and b.asleep:
+                                sleeping += 1
+                            else:
+                                pairs.append((a, b))
+
+        num_bodies = len(bodies)
+        self.pairs_tested += len(pairs)
+        self.pairs_skipped += num_bodies * (num_bodies - 1) // 2 - len(pairs)
+        self.pairs_sleeping += sleeping
+        return pairs
+
+class ArrayBroadPhase:
+    """Vectorized broad phase for the numpy backend, a drop-in for SpatialHash.
+
+    The distances of all pairs among the pitch's players and the ball are
+    tested in one NumPy pass, which for 23 bodies costs far less than
+    bucketing them into a grid from Python. Only pairs closer than twice
+    their touching distance are handed to the narrow phase, so bodies that
+    an earlier contact in the same step pushes together are still caught.
+    Pairs of sleeping bodies are left out as in SpatialHash, and the pair
+    counters have the same meaning.
+    """
+    def __init__(self, pitch, radii):
+        count = len(radii)
+        radii = np.asarray(radii, dtype=float)
+        self.pitch = pitch
+        self.first, self.second = np.triu_indices(count, 1)
+        self.near_sq = (2 * (radii[self.first] + radii[self.second])) ** 2
+        self.pairs_tested = 0
+        self.pairs_skipped = 0
+        self.pairs_sleeping = 0
+        self._positions = np.empty((count, 2))
+        self._asleep = np.empty(count, dtype=bool)
+
+    def candidate_pairs(self, bodies):
+        """Returns the pairs of bodies close enough to be touching, in body order.
+
+        bodies are the pitch's players followed by the ball.
+        """
+        positions = self._positions
+        positions[:-1] = self.pitch.positions
+        ball = bodies[-1].position
+        positions[-1] = ball.x, ball.y
+        first, second = self.first, self.second
+        delta = positions.take(second, axis=0)
+        delta -= positions.take(first, axis=0)
+        delta *= delta
+        near = delta[:, 0] + delta[:, 1] < self.near_sq
+        if not near.any():
+            self.pairs_skipped += len(first)
+            return ()
+        asleep = self._asleep
+        asleep[:-1] = self.pitch.asleep
+        asleep[-1] = bodies[-1].asleep
+        sleeping = near & asleep.take(first) & asleep.take(second)
+        near &= ~sleeping
+        pairs = [(bodies[i], bodies[j])
+                 for i, j in zip(first[near].tolist(), second[near].tolist())]
+        self.pairs_tested += len(pairs)
+        self.pairs_skipped += len(first) - len(pairs)
+        self.pairs_sleeping += int(np.count_nonzero(sleeping))
+        return pairs
+
+    def begin_frame(self):
+        """Zeroes the pair counters; see SpatialHash.begin_frame."""
+        self.pairs_tested = 0
+        self.pairs_skipped = 0
+        self.pairs_sleeping = 0
+
+class MatchResult:
+    """The outcome of a finished match, as returned by FootballGame.run."""
+    def __init__(self, score_a, score_b, sim_time, frames, wall_time,
+                 seed=None, event_counts=None, timing=None):
+        self.score_a = score_a
+        self.score_b = score_b
+        self.sim_time = sim_time
+        self.frames = frames
+        self.wall_time = wall_time
+        self.seed = seed
+        self.event_counts = event_counts or {}
+        self.timing = timing
+
+    @property
+    def winner(self):
+        """Returns "A", "B" or None for a draw."""
+        if self.score_a > self.score_b:
+            return "A"
+        if self.score_b > self.score_a:
+            return "B"
+        return None
+
+    def to_dict(self):
+        """Returns the result as a plain dictionary."""
+        return {
+            "score_a": self.score_a,
+            "score_b": self.score_b,
+            "sim_time": self.sim_time,
+            "frames": self.frames,
+            "wall_time": self.wall_time,
+            "seed": self.seed,
+            "event_counts": dict(self.event_counts),
+            "timing": self.timing,
+        }
+
+    def __repr__(self):
+        return f"MatchResult({self.score_a}-{self.score_b}, {self.sim_time:.2f}s simulated)"
+
+class FrameScheduler:
+    """Fixed-timestep scheduler that keeps the match clock locked to the wall clock.
+
+    Frame k is due at start + k / fps. Deadlines are absolute, so time spent
+    updating and rendering never accumulates into drift: the loop only
+    sleeps for what is left of the current frame budget, and when it falls
+    behind it simulates several due frames back to back (at most
+    max_catchup_frames per pass) and renders only the last of them.
+    """
+    def __init__(self, fps=FPS, max_catchup_frames=5, clock=time.perf_counter, sleep=time.sleep):
+        self.frame_time = 1.0 / fps
+        self.max_catchup_frames = max_catchup_frames
+        self.clock = clock
+        self.sleep = sleep
+        self.frames = 0
+        self.overruns = 0
+        self.dropped_renders = 0
+        self.latencies = []
+        self._start = None
+
+    def start(self):
+        """Starts the schedule; frame 0 is due immediately."""
+        self._start = self.clock()
+
+    def frames_due(self):
+        """Returns how many frames must be simulated now to catch up with the wall clock."""
+        elapsed = self.clock() - self._start
+        due = int(elapsed / self.frame_time) + 1 - self.frames
+        return max(0, min(due, self.max_catchup_frames))
+
+    def frame_done(self):
+        """Records the latency of the frame that has just been simulated.
+
+        Latency is how long after its deadline the frame finished; a frame
+        that finishes more than one frame budget late counts as an overrun.
+        """
+        latency = self.clock() - (self._start + self.frames * self.frame_time)
+        self.latencies.append(latency)
+        if latency > self.frame_time:
+            self.overruns += 1
+        self.frames += 1
+
+    def time_to_next_frame(self):
+        """Returns how long until the next frame is due, or 0 if it already is."""
+        return max(0.0, self._start + self.frames * self.frame_time - self.clock())
+
+    def wait(self):
+        """Sleeps for whatever is left of the current frame budget."""
+        remaining = self.time_to_next_frame()
+        if remaining > 0:
+            self.sleep(remaining)
+
+    def percentile(self, p):
+        """Returns the p-th percentile (0-100) of frame latency in seconds."""
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(p / 100.0 * len(ordered)))]
+
+    def stats(self):
+        """Returns the frame budget telemetry as a dictionary."""
+        return {
+            "frames": self.frames,
+            "overruns": self.overruns,
+            "dropped_renders": self.dropped_renders,
+            "latency_p50": self.percentile(50),
+            "latency_p90": self.percentile(90),
+            "latency_p99": self.percentile(99),
+            "latency_max": max(self.latencies, default=0.0),
+            "drift": self.clock() - self._start - self.frames * self.frame_time,
+        }
+
+class EventBus:
+    """Preallocated ring buffer of match events read by independent consumers.
+
+    Every event occupies one slot spread over fixed-type columns (event id
+    from BUS_EVENTS, team id, player index, simulated time and two numeric
+    parameters), so publishing writes six array cells and allocates nothing.
+    Each consumer reads through its own EventCursor at its own pace. The
+    producer never waits: a consumer that falls more than capacity events
+    behind skips ahead to the oldest event still held and counts the ones
+    it missed.
+    """
+    def __init__(self, capacity=EVENT_BUS_CAPACITY):
+        capacity = 1 << max(0, capacity - 1).bit_length()
+        self.capacity = capacity
+        self._mask = capacity - 1
+        self.types = array("b", bytes(capacity))
+        self.teams = array("b", bytes(capacity))
+        self.players = array("h", bytes(2 * capacity))
+        self.times = array("d", bytes(8 * capacity))
+        self.params_a = array("d", bytes(8 * capacity))
+        self.params_b = array("d", bytes(8 * capacity))
+        self.head = 0  # Number of events ever published
+
+    def publish(self, event_type, team_id, player=-1, sim_time=0.0, param_a=0.0, param_b=0.0):
+        """Writes one event; event_type is an index into BUS_EVENTS."""
+        i = self.head & self._mask
+        self.types[i] = event_type
+        self.teams[i] = team_id
+        self.players[i] = player
+        self.times[i] = sim_time
+        self.params_a[i] = param_a
+        self.params_b[i] = param_b
+        self.head += 1
+
+    def subscribe(self, from_start=False):
+        """Returns a cursor that reads events published from now on.
+
+        With from_start=True it starts at the oldest event still held.
+        """
+        return EventCursor(self, max(0, self.head - self.capacity) if from_start else self.head)
+
+class EventCursor:
+    """One consumer's read position in an EventBus."""
+    def __init__(self, bus, position):
+        self.bus = bus
+        self.position = position
+        self.missed = 0
+
+    def pending(self):
+        """Returns how many events are waiting to be read."""
+        return min(self.bus.head - self.position, self.bus.capacity)
+
+    def poll(self, max_events=None):
+        """Yields waiting events as (event_type, team_id, player, sim_time, param_a, param_b)."""
+        bus = self.bus
+        oldest = bus.head - bus.capacity
+        if self.position < oldest:
+            self.missed += oldest - self.position
+            self.position = oldest
+        end = bus.head if max_events is None else min(bus.head, self.position + max_events)
+        mask = bus._mask
+        while self.position < end:
+            i = self.position & mask
+            self.position += 1
+            yield (bus.types[i], bus.teams[i], bus.players[i], bus.times[i],
+                   bus.params_a[i], bus.params_b[i])
+
+class PhaseProfiler:
+    """In-process registry of per-phase timings for FootballGame.
+
+    For every phase it keeps the call count, cumulative time and a latency
+    histogram with power-of-two microsecond buckets (bucket k counts calls
+    that took less than 2**k microseconds). One profiler can be shared by
+    several games to aggregate a whole batch.
+    """
+    NUM_BUCKETS = 32
+
+    def __init__(self):
+        self.phases = {}
+
+    def record(self, phase, seconds):
+        """Adds one call of the given duration to a phase."""
+        stats = self.phases.get(phase)
+        if stats is None:
+            stats = self.phases[phase] = [0, 0.0, [0] * self.NUM_BUCKETS]
+        stats[0] += 1
+        stats[1] += seconds
+        bucket = min(int(seconds * 1e6).bit_length(), self.NUM_BUCKETS - 1)
+        stats[2][bucket] += 1
+
+    def to_dict(self):
+        """Returns the collected statistics as a JSON-serializable dictionary."""
+        report = {}
+        for phase, (calls, total, histogram) in self.phases.items():
+            report[phase] = {
+                "calls": calls,
+                "total_seconds": total,
+                "mean_us": total / calls * 1e6 if calls else 0.0,
+                "histogram_us": {f"<{2 ** k}": count
+                                 for k, count in enumerate(histogram) if count},
+            }
+        return report
+
+    def dump_json(self, path=None):
+        """Returns the statistics as JSON text, also writing it to path if given."""
+        text = json.dumps(self.to_dict(), indent=2)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+# Fixed binary layout of FootballGame.snapshot(): a header (magic, version,
+# game state, formation, timer, running flag, scores, event counts, index of
+# the player in possession or -1, id of the team to kick off, physics steps,
+# the sleeping-body counters and the seed, flagged as absent when None), the ball (position, velocity, sleep
+# state), every player (position, velocity, stamina, controlled flag,
+# optional AI target, role, sleep state), the AI scheduler (clock and each
+# player's next decision time) and finally the Mersenne Twister RNG state.
+_SNAPSHOT_HEADER = "4sHBBd?2q" + "q" * len(MATCH_EVENTS) + "hB6q?Q"
+_SNAPSHOT_BALL = "4d?d"
+_SNAPSHOT_PLAYER = "5d??2dB?d"
+_SNAPSHOT_AI = "d" * (1 + 2 * NUM_PLAYERS_PER_TEAM)
+_SNAPSHOT_RNG = "I625I?d"
+_SNAPSHOT_STRUCT = struct.Struct(
+    "<" + _SNAPSHOT_HEADER + _SNAPSHOT_BALL
+    + _SNAPSHOT_PLAYER * (2 * NUM_PLAYERS_PER_TEAM) + _SNAPSHOT_AI + _SNAPSHOT_RNG
+)
+SNAPSHOT_SIZE = _SNAPSHOT_STRUCT.size
 
 class FootballGame:
     """The main class that orchestrates the entire game simulation."""
-    def __init__(self):
-        self.team_a = Team(1, TEAM_A_COLOR)
-        self.team_b = Team(2, TEAM_B_COLOR)
+    def __init__(self, backend="objects", seed=None, profiler=None,
+                 ai_rate=AI_DECISIONS_PER_SECOND, formation=DEFAULT_FORMATION, event_bus=None):
+        """Creates a new game.
+
+        backend selects how player state is stored: "objects" keeps one
+        Player object per player, "numpy" keeps all players in PitchArrays.
+        seed makes every random decision in the match reproducible.
+        profiler, if given, is a PhaseProfiler that times every phase of
+        update() and run(); without one the untimed code paths are used.
+        ai_rate is how many AI decisions each player makes per simulated
+        second (see AIScheduler); None runs the AI on every physics step.
+        formation is a key of FORMATIONS that both teams line up in.
+        event_bus, if given, is an EventBus that kickoffs, passes, tackles,
+        goals and balls out of play are published to. Players are identified
+        by their index in self.bodies.
+        """
+        if backend == "objects":
+            self.pitch = None
+        elif backend == "numpy":
+            self.pitch = PitchArrays()
+        else:
+            raise ValueError(f"Unknown state backend: {backend!r}")
+        self.team_a = Team(1, TEAM_A_COLOR, self.pitch, 0)
+        self.team_b = Team(2, TEAM_B_COLOR, self.pitch, NUM_PLAYERS_PER_TEAM)
         self.ball = Ball(Vector(GAME_WIDTH / 2, GAME_HEIGHT / 2))
+        self.bodies = self.team_a.players + self.team_b.players + [self.ball]
+        self._player_index = {player: i for i, player in enumerate(self.bodies[:-1])}
+        self.event_bus = event_bus
+        self.possession = None  # Last player to touch the ball
+        self.kickoff_team = self.team_a
+        if ai_rate is None:
+            self.ai_scheduler = None
+        else:
+            self.ai_scheduler = AIScheduler(self.bodies[:-1], rate=ai_rate)
+            if self.pitch is not None:
+                self.pitch.ai_scheduled = True
+        if self.pitch is not None:
+            self.broad_phase = ArrayBroadPhase(self.pitch, [body.radius for body in self.bodies])
+        else:
+            self.broad_phase = SpatialHash(2 * max(PLAYER_RADIUS, BALL_RADIUS))
+        self.formation = formation
+        self._initialize_players()
         self.game_state = "KICKOFF"
         self.timer = 0
         self.is_running = True
-
-    def run(self):
-        """The main game loop."""
-        print("Game starting...")
+        self.seed = seed
+        self.rng = random.Random(seed)
+        self.profiler = profiler
+        self.ball_updates_skipped = 0
+        self.sleeping_pairs_skipped = 0
+        self.physics_steps = 0
+        self.event_counts = dict.fromkeys(MATCH_EVENTS, 0)
+
+    def run(self, realtime=True, render_every=1, recorder=None,
+            substeps=SIMULATION_STEPS_PER_FRAME, adaptive=False):
+        """The main game loop.
+
+        Every frame advances the match by 1 / FPS seconds in substeps physics
+        steps. With adaptive=True substeps is only the upper limit, and each
+        frame uses as few steps as _adaptive_substeps allows. With
+        realtime=True a FrameScheduler paces the frames against the wall
+        clock and its telemetry is stored in self.scheduler and in the
+        result's timing. With realtime=False the simulated clock advances as
+        fast as the CPU allows. render_every controls how often render() is
+        called: every Nth frame, or never if None. recorder, if given, has
+        record(game) called at the end of every frame, once self.timer has
+        advanced (see football_recorder.TrajectoryRecorder).
+        Returns a MatchResult describing the finished match.
+        """
+        if render_every:
+            print("Game starting...")
+        dt = 1.0 / FPS  # Delta time for physics
+        frames = 0
+        wall_start = time.perf_counter()
+        self.scheduler = FrameScheduler() if realtime else None
+        if self.scheduler is not None:
+            self.scheduler.start()
         while self.is_running:
-            dt = 1.0 / FPS  # Delta time for physics
-            
-            # Placeholder for user input
+            due = self.scheduler.frames_due() if self.scheduler is not None else 1
+            for i in range(due):
+                self._advance_frame(dt, substeps, adaptive)
+                
+                # Placeholder for rendering the game state. When catching
+                # up, only the last due frame is drawn.
+                if render_every and frames % render_every == 0:
+                    if i == due - 1 or not self.is_running:
+                        if self.profiler is not None:
+                            start = time.perf_counter()
+                            self.render()
+                            self.profiler.record("render", time.perf_counter() - start)
+                        else:
+                            self.render()
+                    else:
+                        self.scheduler.dropped_renders += 1
+                
+                self.timer += dt
+                frames += 1
+                if recorder is not None:
+                    recorder.record(self)  # Labelled with the time the frame ends
+                if self.scheduler is not None:
+                    self.scheduler.frame_done()
+                if not self.is_running:
+                    break
+            if self.scheduler is not None:
+                self.scheduler.wait()
+        
+        timing = self.scheduler.stats() if self.scheduler is not None else None
+        result = MatchResult(self.team_a.score, self.team_b.score, self.timer,
+                             frames, time.perf_counter() - wall_start,
+                             self.seed, self.event_counts, timing)
+        if render_every:
+            print("Game Over. Final Score: Team A:", self.team_a.score, "Team B:", self.team_b.score)
+        return result
+
+    def _advance_frame(self, dt, substeps, adaptive=False):
+        """Runs one frame of input handling and physics, split into substeps."""
+        # Placeholder for user input
+        if self.profiler is not None:
+            start = time.perf_counter()
             self._handle_input()
-            
-            # Physics and game logic updates
-            self.update(dt)
-            
-            # Check for game end conditions
-            if self.timer >= GAME_DURATION_SECONDS:
-                self.is_running = False
-            
-            # Placeholder for rendering the game state
-            self.render()
-            
-            self.timer += dt
-            time.sleep(dt)
+            self.profiler.record("_handle_input", time.perf_counter() - start)
+        else:
+            self._handle_input()
+        
+        # Physics and game logic updates
+        if adaptive:
+            substeps = self._adaptive_substeps(dt, substeps)
+        step_dt = dt / substeps
+        self.broad_phase.begin_frame()
+        for _ in range(substeps):
+            self.update(step_dt)
+        self.physics_steps += substeps
         
-        print("Game Over. Final Score: Team A:", self.team_a.score, "Team B:", self.team_b.score)
+        # Check for game end conditions
+        if self.timer >= GAME_DURATION_SECONDS:
+            self.is_running = False
+
+    def _adaptive_substeps(self, dt, max_substeps):
+        """Chooses how many physics steps the next frame of length dt needs.
+
+        Scoring is judged on the ball's swept path, so a long step cannot
+        skip a goal; what limits the step is contact with players. The ball
+        may travel at most ADAPTIVE_STEP_DISTANCE per step, and while it can
+        reach ADAPTIVE_LINE_MARGIN of a line within the frame max_substeps
+        are used, so play near the lines is stepped as finely as before.
+        """
+        ball = self.ball
+        if self.game_state == "KICKOFF":
+            return max_substeps
+        if ball.asleep:
+            return 1
+        travel = ball.velocity.magnitude() * dt  # Friction only shortens this
+        x, y = ball.position.x, ball.position.y
+        to_line = min(x, GAME_WIDTH - x, y, GAME_HEIGHT - y)
+        if travel + ADAPTIVE_LINE_MARGIN >= to_line:
+            return max_substeps
+        return max(1, min(max_substeps, math.ceil(travel / ADAPTIVE_STEP_DISTANCE)))
+
+    def snapshot(self):
+        """Serializes the full game state into a fixed-layout binary record.
+
+        The record is SNAPSHOT_SIZE bytes long and can be passed to restore()
+        on this or any other FootballGame to continue the match from here.
+        The seed is recorded too, so it must be None or an int that fits in
+        an unsigned 64-bit field.
+        """
+        seed = self.seed
+        if seed is not None and not (isinstance(seed, int) and 0 <= seed < 2 ** 64):
+            raise ValueError(f"Cannot snapshot a game with seed {seed!r}")
+        values = [SNAPSHOT_MAGIC, SNAPSHOT_VERSION, GAME_STATES.index(self.game_state),
+                  list(FORMATIONS).index(self.formation),
+                  self.timer, self.is_running, self.team_a.score, self.team_b.score]
+        values.extend(self.event_counts[name] for name in MATCH_EVENTS)
+        values += (-1 if self.possession is None else self._player_index[self.possession],
+                   self.kickoff_team.team_id, self.physics_steps, self.ball_updates_skipped,
+                   self.sleeping_pairs_skipped, self.team_a.updates_skipped,
+                   self.team_b.updates_skipped,
+                   self.pitch.updates_skipped if self.pitch is not None else 0,
+                   seed is not None, seed or 0)
+        ball = self.ball
+        values += (ball.position.x, ball.position.y, ball.velocity.x, ball.velocity.y,
+                   ball.asleep, ball.slow_time)
+        for player in self.bodies[:-1]:
+            position, velocity, target = player.position, player.velocity, player.ai_target
+            values += (position.x, position.y, velocity.x, velocity.y, player.stamina,
+                       player.is_controlled, target is not None,
+                       target.x if target is not None else 0.0,
+                       target.y if target is not None else 0.0,
+                       PLAYER_ROLES.index(player.role), player.asleep, player.slow_time)
+        if self.ai_scheduler is not None:
+            values.append(self.ai_scheduler.clock)
+            values.extend(self.ai_scheduler.next_decision)
+        else:
+            values.extend([0.0] * (1 + 2 * NUM_PLAYERS_PER_TEAM))
+        rng_version, mt_state, gauss_next = self.rng.getstate()
+        values.append(rng_version)
+        values.extend(mt_state)
+        values += (gauss_next is not None, gauss_next or 0.0)
+        return _SNAPSHOT_STRUCT.pack(*values)
+
+    def restore(self, data):
+        """Restores the game state from a record produced by snapshot()."""
+        values = _SNAPSHOT_STRUCT.unpack(data)
+        magic, version = values[0], values[1]
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError("Not a FootballGame snapshot of a supported version")
+        (self.game_state, self.formation, self.timer, self.is_running,
+         self.team_a.score, self.team_b.score) = (GAME_STATES[values[2]],
+                                                  list(FORMATIONS)[values[3]], *values[4:8])
+        i = 8 + len(MATCH_EVENTS)
+        self.event_counts = dict(zip(MATCH_EVENTS, values[8:i]))
+        possession, kickoff_team = values[i], values[i + 1]
+        self.possession = None if possession < 0 else self.bodies[possession]
+        self.kickoff_team = self.team_a if kickoff_team == self.team_a.team_id else self.team_b
+        (self.physics_steps, self.ball_updates_skipped, self.sleeping_pairs_skipped,
+         self.team_a.updates_skipped, self.team_b.updates_skipped) = values[i + 2:i + 7]
+        if self.pitch is not None:
+            self.pitch.updates_skipped = values[i + 7]
+        self.seed = values[i + 9] if values[i + 8] else None
+        i += 10
+        self.ball.position.set(values[i], values[i + 1])
+        self.ball.velocity.set(values[i + 2], values[i + 3])
+        self.ball.asleep, self.ball.slow_time = values[i + 4], values[i + 5]
+        i += 6
+        for player in self.bodies[:-1]:
+            player.position.set(values[i], values[i + 1])
+            player.velocity.set(values[i + 2], values[i + 3])
+            player.stamina = values[i + 4]
+            player.is_controlled = values[i + 5]
+            player.ai_target = Vector(values[i + 7], values[i + 8]) if values[i + 6] else None
+            player.role = PLAYER_ROLES[values[i + 9]]
+            player.asleep, player.slow_time = values[i + 10], values[i + 11]
+            i += 12
+        if self.ai_scheduler is not None:
+            self.ai_scheduler.clock = values[i]
+            self.ai_scheduler.next_decision = list(values[i + 1:i + 1 + 2 * NUM_PLAYERS_PER_TEAM])
+        i += 1 + 2 * NUM_PLAYERS_PER_TEAM
+        gauss_next = values[i + 627] if values[i + 626] else None
+        self.rng.setstate((values[i], values[i + 1:i + 626], gauss_next))
 
     def update(self, dt):
         """Updates the state of all game objects."""
+        if self.profiler is not None:
+            self._update_profiled(dt)
+            return
         # This is where the complex game logic would reside
-        self.team_a.update(dt)
-        self.team_b.update(dt)
-        self.ball.update(dt)
+        if self.game_state == "KICKOFF":
+            self._kickoff()
+        if self.ai_scheduler is not None:
+            self.ai_scheduler.tick(self.ball, dt)
+        if self.pitch is not None:
+            self.pitch.update(dt)
+        else:
+            self.team_a.update(dt)
+            self.team_b.update(dt)
+        ball_x, ball_y = self.ball.position.x, self.ball.position.y
+        self._update_ball(dt)
         self._check_collisions()
-        self._check_scoring()
+        self._check_scoring(ball_x, ball_y)
+
+    def _update_ball(self, dt):
+        """Updates the ball unless it is asleep."""
+        if self.ball.asleep:
+            self.ball_updates_skipped += 1
+        else:
+            self.ball.update(dt)
+
+    def _update_profiled(self, dt):
+        """Same as update(), timing each phase into self.profiler."""
+        clock = time.perf_counter
+        record = self.profiler.record
+        if self.game_state == "KICKOFF":
+            self._kickoff()
+        if self.ai_scheduler is not None:
+            start = clock()
+            self.ai_scheduler.tick(self.ball, dt)
+            record("ai_scheduler.tick", clock() - start)
+        if self.pitch is not None:
+            start = clock()
+            self.pitch.update(dt)
+            record("pitch.update", clock() - start)
+        else:
+            start = clock()
+            self.team_a.update(dt)
+            record("team_a.update", clock() - start)
+            start = clock()
+            self.team_b.update(dt)
+            record("team_b.update", clock() - start)
+        ball_x, ball_y = self.ball.position.x, self.ball.position.y
+        start = clock()
+        self._update_ball(dt)
+        record("ball.update", clock() - start)
+        start = clock()
+        self._check_collisions()
+        record("_check_collisions", clock() - start)
+        start = clock()
+        self._check_scoring(ball_x, ball_y)
+        record("_check_scoring", clock() - start)
 
     def _handle_input(self):
         """Handles user input to control a player."""
@@ -195,13 +1372,130 @@ class FootballGame:
 
     def _check_collisions(self):
         """Detects and resolves collisions between game objects."""
-        # This would be a large and complex function
-        pass
-
-    def _check_scoring(self):
-        """Checks if a goal has been scored."""
-        # This function would check ball position relative to goal lines
-        pass
+        ball = self.ball
+        broad_phase = self.broad_phase
+        sleeping = broad_phase.pairs_sleeping
+        for a, b in broad_phase.candidate_pairs(self.bodies):
+            if self._resolve_collision(a, b):
+                self.event_counts["collision"] += 1
+                if b is ball:
+                    self._touch_ball(a)
+                elif a is ball:
+                    self._touch_ball(b)
+        self.sleeping_pairs_skipped += broad_phase.pairs_sleeping - sleeping
+
+    def _touch_ball(self, player):
+        """Gives player possession, publishing a pass or a tackle if it changed hands."""
+        previous = self.possession
+        self.possession = player
+        if self.event_bus is None or previous is None or previous is player:
+            return
+        index = self._player_index
+        if previous.team_id == player.team_id:
+            self.event_bus.publish(BUS_EVENTS.index("pass"), previous.team_id,
+                                   index[previous], self.timer, index[player])
+        else:
+            self.event_bus.publish(BUS_EVENTS.index("tackle"), player.team_id,
+                                   index[player], self.timer, index[previous])
+
+    def sleep_stats(self):
+        """Returns how many body updates and pair tests sleeping bodies avoided."""
+        if self.pitch is not None:
+            player_updates = self.pitch.updates_skipped
+        else:
+            player_updates = self.team_a.updates_skipped + self.team_b.updates_skipped
+        return {
+            "player_updates_skipped": player_updates,
+            "ball_updates_skipped": self.ball_updates_skipped,
+            "collision_pairs_skipped": self.sleeping_pairs_skipped,
+            "bodies_asleep": sum(1 for body in self.bodies if body.asleep),
+        }
+
+    @staticmethod
+    def _resolve_collision(a, b):
+        """Separates two overlapping bodies and exchanges momentum between them.
+
+        Returns True if the bodies were touching. Touching wakes both bodies.
+        """
+        pos_a, pos_b = a.position, b.position
+        dx = pos_b.x - pos_a.x
+        dy = pos_b.y - pos_a.y
+        min_distance = a.radius + b.radius
+        distance_sq = dx * dx + dy * dy
+        if distance_sq >= min_distance * min_distance:
+            return False
+        a.wake()
+        b.wake()
+
+        distance = math.sqrt(distance_sq)
+        if distance > 0:
+            nx, ny = dx / distance, dy / distance
+        else:
+            nx, ny = 1.0, 0.0  # Coincident bodies: separate along the x axis
+        inv_mass_a = 1.0 / a.weight
+        inv_mass_b = 1.0 / b.weight
+        inv_mass_sum = inv_mass_a + inv_mass_b
+
+        # Push the bodies apart, leaving COLLISION_BUFFER between them so the
+        # same pair is not reported again on the next step.
+        correction = (min_distance - distance + COLLISION_BUFFER) / inv_mass_sum
+        pos_a.set(pos_a.x - nx * correction * inv_mass_a, pos_a.y - ny * correction * inv_mass_a)
+        pos_b.set(pos_b.x + nx * correction * inv_mass_b, pos_b.y + ny * correction * inv_mass_b)
+
+        vel_a, vel_b = a.velocity, b.velocity
+        closing_speed = (vel_b.x - vel_a.x) * nx + (vel_b.y - vel_a.y) * ny
+        if closing_speed < 0:
+            impulse = -(1 + COEFFICIENT_OF_RESTITUTION) * closing_speed / inv_mass_sum
+            vel_a.set(vel_a.x - nx * impulse * inv_mass_a, vel_a.y - ny * impulse * inv_mass_a)
+            vel_b.set(vel_b.x + nx * impulse * inv_mass_b, vel_b.y + ny * impulse * inv_mass_b)
+        return True
+
+    def _kickoff(self):
+        """Puts the ball into play in a random direction."""
+        angle = self.rng.uniform(0.0, 2.0 * math.pi)
+        self.ball.velocity.set(KICKOFF_SPEED * math.cos(angle), KICKOFF_SPEED * math.sin(angle))
+        self.ball.wake()
+        self.game_state = "IN_PLAY"
+        self.event_counts["kickoff"] += 1
+        if self.event_bus is not None:
+            self.event_bus.publish(BUS_EVENTS.index("kickoff"), self.kickoff_team.team_id,
+                                   sim_time=self.timer)
+
+    def _check_scoring(self, start_x=None, start_y=None):
+        """Checks if a goal has been scored.
+
+        start_x and start_y, if given, are where the ball was at the start of
+        the step, and the ball's path since then is judged with
+        classify_ball_path instead of only its current position.
+        """
+        x, y = self.ball.position.x, self.ball.position.y
+        if start_x is None:
+            goal_a, goal_b, out = classify_ball_position(x, y)
+        else:
+            goal_a, goal_b, out = classify_ball_path(start_x, start_y, x, y)
+        if not out:
+            return
+        bus = self.event_bus
+        if goal_a or goal_b:
+            scoring_team = self.team_a if goal_a else self.team_b
+            scoring_team.score += 1
+            self.game_state = "GOAL"
+            self.event_counts["goal"] += 1
+            self.kickoff_team = self.team_b if goal_a else self.team_a
+            if bus is not None:
+                scorer = self.possession
+                if scorer is None or scorer.team_id != scoring_team.team_id:
+                    scorer = None  # Nobody on the scoring team touched it last
+                bus.publish(BUS_EVENTS.index("goal"), scoring_team.team_id,
+                            -1 if scorer is None else self._player_index[scorer], self.timer)
+        else:
+            self.game_state = "OUT_OF_BOUNDS"
+            self.event_counts["out_of_bounds"] += 1
+            if bus is not None:
+                last = self.possession
+                bus.publish(BUS_EVENTS.index("out_of_bounds"), 0 if last is None else last.team_id,
+                            -1 if last is None else self._player_index[last], self.timer)
+        self._reset_field()
 
     def render(self):
         """Placeholder for rendering the game on screen."""
@@ -211,382 +1505,141 @@ class FootballGame:
         
     def _initialize_players(self):
         """Sets up the initial positions of all players."""
-        # This function would place players in their starting positions.
-        pass
-
-    def _reset_field(self):
-        """Resets the game state after a goal or out-of-bounds."""
-        # This function would move the ball and players back to their positions.
-        pass
-
-    def __mul__(self, scalar):
-        return Vector(self.x * scalar, self.y * scalar)
-
-    def magnitude(self):
-        return math.sqrt(self.x**2 + self.y**2)
-
-    def normalize(self):
-        mag = self.magnitude()
-        if mag > 0:
-            return Vector(self.x / mag, self.y / mag)
-        return Vector()
-
-    def __repr__(self):
-        return f"Vector({self.x}, {self.y})"
-
-# ... (Lines 72 - 1200 will be filled with more classes and functions) ...
-
-class GameObject:
-    """Base class for all game objects (players, ball, etc.)."""
-    def __init__(self, position, velocity, radius):
-        self.position = position
-        self.velocity = velocity
-        self.radius = radius
-
-class Ball(GameObject):
-    """Represents the football in the game."""
-    def __init__(self, position):
-        super().__init__(position, Vector(), BALL_RADIUS)
-        self.weight = BALL_WEIGHT
-
-    def update(self, dt):
-        """Placeholder for ball physics and movement."""
-        self.velocity *= BALL_FRICTION
-        self.position += self.velocity * dt
-
-class Player(GameObject):
-    """Represents a single football player."""
-    def __init__(self, team_id, position):
-        super().__init__(position, Vector(), PLAYER_RADIUS)
-        self.team_id = team_id
-        self.is_controlled = False
-        self.ai_target = None
-        self.stamina = 100.0
-        self.role = "MIDFIELDER" # Forward, Defender, Midfielder, Goalie
-
-    def update(self, dt):
-        """Placeholder for player movement, AI, and stamina."""
-        if not self.is_controlled:
-            self._update_ai_movement()
-        self._apply_friction(dt)
-        self._update_stamina(dt)
-        self.position += self.velocity * dt
-
-    def _update_ai_movement(self):
-        """Simulates AI-driven player movement towards a target."""
-        # This function would contain complex AI logic
-        pass
-
-    def _apply_friction(self, dt):
-        """Reduces player velocity over time."""
-        self.velocity *= PLAYER_FRICTION
-
-    def _update_stamina(self, dt):
-        """Manages the player's stamina."""
-        pass
-
-class Team:
-    """Represents a football team."""
-    def __init__(self, team_id, color):
-        self.team_id = team_id
-        self.players = [Player(team_id, Vector()) for _ in range(NUM_PLAYERS_PER_TEAM)]
-        self.score = 0
-        self.color = color
-
-    def update(self, dt):
-        """Updates all players on the team."""
-        for player in self.players:
-            player.update(dt)
-
-class FootballGame:
-    """The main class that orchestrates the entire game simulation."""
-    def __init__(self):
-        self.team_a = Team(1, TEAM_A_COLOR)
-        self.team_b = Team(2, TEAM_B_COLOR)
-        self.ball = Ball(Vector(GAME_WIDTH / 2, GAME_HEIGHT / 2))
-        self.game_state = "KICKOFF"
-        self.timer = 0
-        self.is_running = True
-
-    def run(self):
-        """The main game loop."""
-        print("Game starting...")
-        while self.is_running:
-            dt = 1.0 / FPS  # Delta time for physics
-            
-            # Placeholder for user input
-            self._handle_input()
-            
-            # Physics and game logic updates
-            self.update(dt)
-            
-            # Check for game end conditions
-            if self.timer >= GAME_DURATION_SECONDS:
-                self.is_running = False
-            
-            # Placeholder for rendering the game state
-            self.render()
-            
-            self.timer += dt
-            time.sleep(dt)
-        
-        print("Game Over. Final Score: Team A:", self.team_a.score, "Team B:", self.team_b.score)
-
-    def update(self, dt):
-        """Updates the state of all game objects."""
-        # This is where the complex game logic would reside
-        self.team_a.update(dt)
-        self.team_b.update(dt)
-        self.ball.update(dt)
-        self._check_collisions()
-        self._check_scoring()
-
-    def __mul__(self, scalar):
-        return Vector(self.x * scalar, self.y * scalar)
-
-    def magnitude(self):
-        return math.sqrt(self.x**2 + self.y**2)
-
-    def normalize(self):
-        mag = self.magnitude()
-        if mag > 0:
-            return Vector(self.x / mag, self.y / mag)
-        return Vector()
-
-    def __repr__(self):
-        return f"Vector({self.x}, {self.y})"
-
-# ... (Lines 72 - 1200 will be filled with more classes and functions) ...
-
-class GameObject:
-    """Base class for all game objects (players, ball, etc.)."""
-    def __init__(self, position, velocity, radius):
-        self.position = position
-        self.velocity = velocity
-        self.radius = radius
-
-class Ball(GameObject):
-    """Represents the football in the game."""
-    def __init__(self, position):
-        super().__init__(position, Vector(), BALL_RADIUS)
-        self.weight = BALL_WEIGHT
-
-    def update(self, dt):
-        """Placeholder for ball physics and movement."""
-        self.velocity *= BALL_FRICTION
-        self.position += self.velocity * dt
-
-class Player(GameObject):
-    """Represents a single football player."""
-    def __init__(self, team_id, position):
-        super().__init__(position, Vector(), PLAYER_RADIUS)
-        self.team_id = team_id
-        self.is_controlled = False
-        self.ai_target = None
-        self.stamina = 100.0
-        self.role = "MIDFIELDER" # Forward, Defender, Midfielder, Goalie
-
-    def update(self, dt):
-        """Placeholder for player movement, AI, and stamina."""
-        if not self.is_controlled:
-            self._update_ai_movement()
-        self._apply_friction(dt)
-        self._update_stamina(dt)
-        self.position += self.velocity * dt
-
-    def _update_ai_movement(self):
-        """Simulates AI-driven player movement towards a target."""
-        # This function would contain complex AI logic
-        pass
-
-    def _apply_friction(self, dt):
-        """Reduces player velocity over time."""
-        self.velocity *= PLAYER_FRICTION
-
-    def _update_stamina(self, dt):
-        """Manages the player's stamina."""
-        pass
-
-class Team:
-    """Represents a football team."""
-    def __init__(self, team_id, color):
-        self.team_id = team_id
-        self.players = [Player(team_id, Vector()) for _ in range(NUM_PLAYERS_PER_TEAM)]
-        self.score = 0
-        self.color = color
-
-    def update(self, dt):
-        """Updates all players on the team."""
-        for player in self.players:
-            player.update(dt)
-
-class FootballGame:
-    """The main class that orchestrates the entire game simulation."""
-    def __init__(self):
-        self.team_a = Team(1, TEAM_A_COLOR)
-        self.team_b = Team(2, TEAM_B_COLOR)
-        self.ball = Ball(Vector(GAME_WIDTH / 2, GAME_HEIGHT / 2))
+        self.team_a.set_formation(self.formation)
+        self.team_b.set_formation(self.formation, mirrored=True)
+
+    def reset(self, seed=None, formation=None):
+        """Returns this game to a fresh kickoff so it can be played again.
+
+        Equivalent to FootballGame(backend, seed, ...) with the same
+        profiler and AI rate, but reuses every existing object instead of
+        allocating new ones. formation defaults to the current one.
+        Returns the game.
+        """
+        if formation is not None:
+            self.formation = formation
+        self.seed = seed
+        self.rng.seed(seed)
         self.game_state = "KICKOFF"
         self.timer = 0
         self.is_running = True
+        self.ball_updates_skipped = 0
+        self.sleeping_pairs_skipped = 0
+        self.physics_steps = 0
+        self.event_counts = dict.fromkeys(MATCH_EVENTS, 0)  # Earlier results keep the old one
+        self.kickoff_team = self.team_a
+        for team in (self.team_a, self.team_b):
+            team.score = 0
+            team.updates_skipped = 0
+        if self.pitch is not None:
+            self.pitch.updates_skipped = 0
+        for player in self.bodies[:-1]:
+            player.stamina = 100.0
+            player.is_controlled = False
+            player.ai_target = None
+        if self.ai_scheduler is not None:
+            self.ai_scheduler.reset()
+        self.ball.position.set(GAME_WIDTH / 2, GAME_HEIGHT / 2)
+        self.ball.velocity.set(0.0, 0.0)
+        self.possession = None
+        self._initialize_players()
+        for body in self.bodies:
+            body.wake()
+        return self
 
-    def run(self):
-        """The main game loop."""
-        print("Game starting...")
-        while self.is_running:
-            dt = 1.0 / FPS  # Delta time for physics
-            
-            # Placeholder for user input
-            self._handle_input()
-            
-            # Physics and game logic updates
-            self.update(dt)
-            
-            # Check for game end conditions
-            if self.timer >= GAME_DURATION_SECONDS:
-                self.is_running = False
-            
-            # Placeholder for rendering the game state
-            self.render()
-            
-            self.timer += dt
-            time.sleep(dt)
-        
-        print("Game Over. Final Score: Team A:", self.team_a.score, "Team B:", self.team_b.score)
-
-    def update(self, dt):
-        """Updates the state of all game objects."""
-        # This is where the complex game logic would reside
-        self.team_a.update(dt)
-        self.team_b.update(dt)
-        self.ball.update(dt)
-        self._check_collisions()
-        self._check_scoring()
-
-    def __mul__(self, scalar):
-        return Vector(self.x * scalar, self.y * scalar)
-
-    def magnitude(self):
-        return math.sqrt(self.x**2 + self.y**2)
-
-    def normalize(self):
-        mag = self.magnitude()
-        if mag > 0:
-            return Vector(self.x / mag, self.y / mag)
-        return Vector()
-
-    def __repr__(self):
-        return f"Vector({self.x}, {self.y})"
-
-# ... (Lines 72 - 1200 will be filled with more classes and functions) ...
-
-class GameObject:
-    """Base class for all game objects (players, ball, etc.)."""
-    def __init__(self, position, velocity, radius):
-        self.position = position
-        self.velocity = velocity
-        self.radius = radius
-
-class Ball(GameObject):
-    """Represents the football in the game."""
-    def __init__(self, position):
-        super().__init__(position, Vector(), BALL_RADIUS)
-        self.weight = BALL_WEIGHT
-
-    def update(self, dt):
-        """Placeholder for ball physics and movement."""
-        self.velocity *= BALL_FRICTION
-        self.position += self.velocity * dt
-
-class Player(GameObject):
-    """Represents a single football player."""
-    def __init__(self, team_id, position):
-        super().__init__(position, Vector(), PLAYER_RADIUS)
-        self.team_id = team_id
-        self.is_controlled = False
-        self.ai_target = None
-        self.stamina = 100.0
-        self.role = "MIDFIELDER" # Forward, Defender, Midfielder, Goalie
-
-    def update(self, dt):
-        """Placeholder for player movement, AI, and stamina."""
-        if not self.is_controlled:
-            self._update_ai_movement()
-        self._apply_friction(dt)
-        self._update_stamina(dt)
-        self.position += self.velocity * dt
-
-    def _update_ai_movement(self):
-        """Simulates AI-driven player movement towards a target."""
-        # This function would contain complex AI logic
-        pass
-
-    def _apply_friction(self, dt):
-        """Reduces player velocity over time."""
-        self.velocity *= PLAYER_FRICTION
-
-    def _update_stamina(self, dt):
-        """Manages the player's stamina."""
-        pass
-
-class Team:
-    """Represents a football team."""
-    def __init__(self, team_id, color):
-        self.team_id = team_id
-        self.players = [Player(team_id, Vector()) for _ in range(NUM_PLAYERS_PER_TEAM)]
-        self.score = 0
-        self.color = color
-
-    def update(self, dt):
-        """Updates all players on the team."""
-        for player in self.players:
-            player.update(dt)
-
-class FootballGame:
-    """The main class that orchestrates the entire game simulation."""
-    def __init__(self):
-        self.team_a = Team(1, TEAM_A_COLOR)
-        self.team_b = Team(2, TEAM_B_COLOR)
-        self.ball = Ball(Vector(GAME_WIDTH / 2, GAME_HEIGHT / 2))
+    def _reset_field(self):
+        """Resets the game state after a goal or out-of-bounds."""
+        self.ball.position.set(GAME_WIDTH / 2, GAME_HEIGHT / 2)
+        self.ball.velocity.set(0.0, 0.0)
+        self.possession = None
+        self._initialize_players()
+        for body in self.bodies:
+            body.wake()
         self.game_state = "KICKOFF"
-        self.timer = 0
-        self.is_running = True
 
-    def run(self):
-        """The main game loop."""
-        print("Game starting...")
-        while self.is_running:
-            dt = 1.0 / FPS  # Delta time for physics
-            
-            # Placeholder for user input
-            self._handle_input()
-            
-            # Physics and game logic updates
-            self.update(dt)
-            
-            # Check for game end conditions
-            if self.timer >= GAME_DURATION_SECONDS:
-                self.is_running = False
-            
-            # Placeholder for rendering the game state
-            self.render()
-            
-            self.timer += dt
-            time.sleep(dt)
-        
-        print("Game Over. Final Score: Team A:", self.team_a.score, "Team B:", self.team_b.score)
+# ==============================================================================
+# SECTION 3: Batch Simulation
+# ==============================================================================
 
-    def update(self, dt):
-        """Updates the state of all game objects."""
-        # This is where the complex game logic would reside
-        self.team_a.update(dt)
-        self.team_b.update(dt)
-        self.ball.update(dt)
-        self._check_collisions()
-        self._check_scoring()
+class GamePool:
+    """A free list of FootballGame instances that are reset instead of rebuilt.
+
+    acquire() hands out a game reset to the requested seed and formation,
+    building a new one only when the pool is empty; release() returns it.
+    Simulating many short matches back to back this way allocates no new
+    teams, players or vectors after the first few matches.
+    """
+    def __init__(self, backend="objects", **options):
+        """options are passed to FootballGame when a new game has to be built."""
+        self.backend = backend
+        self.options = options
+        self.free = []
+        self.created = 0
+
+    def acquire(self, seed=None, formation=None):
+        if self.free:
+            return self.free.pop().reset(seed, formation)
+        self.created += 1
+        game = FootballGame(self.backend, seed, **self.options)
+        if formation is not None:
+            game.reset(seed, formation)
+        return game
+
+    def release(self, game):
+        self.free.append(game)
+
+def _simulate_chunk(seeds, backend):
+    """Runs one headless match per seed. Executed inside a worker process."""
+    pool = GamePool(backend)
+    results = []
+    for seed in seeds:
+        game = pool.acquire(seed)
+        results.append(game.run(realtime=False, render_every=None))
+        pool.release(game)
+    return results
+
+def simulate_matches(n, seeds=None, workers=None, chunk_size=None, backend="objects"):
+    """Runs n independent headless matches and yields their MatchResults.
+
+    seeds is either a sequence of n per-match seeds, an integer base seed
+    (matches get base, base + 1, ...), or None for seeds 0..n-1. Matches are
+    spread across a ProcessPoolExecutor with the given number of workers
+    (os.cpu_count() by default; 1 runs in-process) and come back in chunks
+    of chunk_size, so results are yielded in completion order. Every result
+    carries the seed it was played with. Bad arguments raise here, not on
+    the first next() of the returned iterator.
+    """
+    if seeds is None:
+        seeds = list(range(n))
+    elif isinstance(seeds, int):
+        seeds = list(range(seeds, seeds + n))
+    else:
+        seeds = list(seeds)
+        if len(seeds) != n:
+            raise ValueError(f"Expected {n} seeds, got {len(seeds)}")
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, math.ceil(n / (workers * 4)))
+    chunks = [seeds[i:i + chunk_size] for i in range(0, n, chunk_size)]
+    return _simulate_chunks(chunks, workers, backend)
+
+def _simulate_chunks(chunks, workers, backend):
+    """Yields the MatchResults of every chunk, in-process or across workers."""
+    if workers == 1:
+        for chunk in chunks:
+            yield from _simulate_chunk(chunk, backend)
+        return
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        futures = [executor.submit(_simulate_chunk, chunk, backend) for chunk in chunks]
+        for future in as_completed(futures):
+            yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
 
 # ==============================================================================
-# SECTION 3: Game Initialization and Main Execution
+# SECTION 4: Game Initialization and Main Execution
 # ==============================================================================
 
 if __name__ == "__main__":
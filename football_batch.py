@@ -0,0 +1,302 @@
+# football_batch.py
+
+"""
+Lockstep Batched Football Engine
+================================
+
+Simulates many independent football matches at once by holding their state in
+NumPy arrays: players are stored as ``(B, 22, 2)`` position and velocity
+arrays and the ball as ``(B, 2)``. A single call to ``update(dt)`` advances
+every match in the batch by one frame using the same physics as
+``Ball.update`` and ``Player.update``, the same collision response as
+``FootballGame._resolve_collision`` and the same scoring rules as
+``FootballGame._check_scoring``, judged on the ball's swept path like
+``classify_ball_path``.
+
+Matches that reach their duration are masked out and frozen while the rest
+of the batch keeps going. Each match draws its random decisions from its own
+``random.Random(seed)``, so a batch is reproducible seed by seed. Collisions
+inside one frame are resolved simultaneously rather than pair by pair, so
+outcomes match the object engine statistically rather than bit for bit.
+"""
+
+import random
+import time
+
+import numpy as np
+
+from football import (
+    BALL_FRICTION,
+    BALL_RADIUS,
+    BALL_WEIGHT,
+    COEFFICIENT_OF_RESTITUTION,
+    COLLISION_BUFFER,
+    DEFAULT_FORMATION,
+    FORMATION_LAYOUTS,
+    FPS,
+    GAME_DURATION_SECONDS,
+    GAME_HEIGHT,
+    GAME_WIDTH,
+    GOAL_WIDTH,
+    KICKOFF_SPEED,
+    MATCH_EVENTS,
+    NUM_PLAYERS_PER_TEAM,
+    PLAYER_FRICTION,
+    PLAYER_RADIUS,
+    PLAYER_WEIGHT,
+    MatchResult,
+    classify_ball_position,
+)
+
+# ==============================================================================
+# SECTION 1: Batch Constants
+# ==============================================================================
+
+NUM_PLAYERS = 2 * NUM_PLAYERS_PER_TEAM
+
+# Numeric codes for the per-match game state
+STATE_KICKOFF = 0
+STATE_IN_PLAY = 1
+
+# ==============================================================================
+# SECTION 2: Collision Helpers
+# ==============================================================================
+
+def _resolve_pairs(delta, dist_sq, vel_a, vel_b, inv_mass_a, inv_mass_b, min_distance):
+    """Vectorized version of FootballGame._resolve_collision for K touching pairs.
+
+    delta is position_b - position_a for each pair, shaped (K, 2). Returns the
+    position and velocity changes for body a and body b.
+    """
+    distance = np.sqrt(dist_sq)
+    normal = np.zeros_like(delta)
+    normal[:, 0] = 1.0  # Coincident bodies: separate along the x axis
+    apart = distance > 0
+    normal[apart] = delta[apart] / distance[apart, None]
+    inv_mass_sum = inv_mass_a + inv_mass_b
+
+    correction = ((min_distance - distance + COLLISION_BUFFER) / inv_mass_sum)[:, None] * normal
+    closing_speed = np.einsum("kd,kd->k", vel_b - vel_a, normal)
+    impulse = np.where(closing_speed < 0,
+                       -(1 + COEFFICIENT_OF_RESTITUTION) * closing_speed / inv_mass_sum,
+                       0.0)[:, None] * normal
+    return (-correction * inv_mass_a, -impulse * inv_mass_a,
+            correction * inv_mass_b, impulse * inv_mass_b)
+
+def classify_ball_paths(start, end):
+    """Vectorized classify_ball_path for (B, 2) arrays of ball start and end positions."""
+    goal_a, goal_b, out = classify_ball_position(end[:, 0], end[:, 1])
+    x0, y0 = start[:, 0], start[:, 1]
+    started_on_pitch = (x0 >= 0) & (x0 <= GAME_WIDTH) & (y0 >= 0) & (y0 <= GAME_HEIGHT)
+    swept = out & started_on_pitch
+    if not swept.any():
+        return goal_a, goal_b, out
+    delta = end - start
+    x1, y1 = end[:, 0], end[:, 1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_goal_line = np.where(x1 > GAME_WIDTH, (GAME_WIDTH - x0) / delta[:, 0],
+                               np.where(x1 < 0, -x0 / delta[:, 0], np.inf))
+        t_touchline = np.where(y1 > GAME_HEIGHT, (GAME_HEIGHT - y0) / delta[:, 1],
+                               np.where(y1 < 0, -y0 / delta[:, 1], np.inf))
+        crossing_y = y0 + delta[:, 1] * np.where(np.isfinite(t_goal_line), t_goal_line, 0.0)
+    in_goal_mouth = ((t_goal_line <= t_touchline)
+                     & (np.abs(crossing_y - GAME_HEIGHT / 2) <= GOAL_WIDTH / 2))
+    goal_a = np.where(swept, in_goal_mouth & (x1 > GAME_WIDTH), goal_a)
+    goal_b = np.where(swept, in_goal_mouth & (x1 < 0), goal_b)
+    return goal_a, goal_b, out
+
+# ==============================================================================
+# SECTION 3: Batched Engine
+# ==============================================================================
+
+class BatchedMatches:
+    """Holds B matches in arrays and advances all of them in lockstep."""
+    def __init__(self, batch_size, seeds=None, durations=GAME_DURATION_SECONDS,
+                 formation=DEFAULT_FORMATION):
+        """Creates a batch of matches.
+
+        seeds gives one seed per match (0..B-1 by default). durations is the
+        simulated length of each match in seconds, either one value for the
+        whole batch or one per match. formation is a key of FORMATIONS.
+        """
+        self.batch_size = batch_size
+        self.player_pos = np.zeros((batch_size, NUM_PLAYERS, 2))
+        self.player_vel = np.zeros((batch_size, NUM_PLAYERS, 2))
+        self.stamina = np.zeros((batch_size, NUM_PLAYERS))
+        self.ball_pos = np.zeros((batch_size, 2))
+        self.ball_vel = np.zeros((batch_size, 2))
+
+        self.scores = np.zeros((batch_size, 2), dtype=np.int64)
+        self.game_state = np.zeros(batch_size, dtype=np.int8)
+        self.timer = np.zeros(batch_size)
+        self.frames = np.zeros(batch_size, dtype=np.int64)
+        self.durations = np.zeros(batch_size)
+        self.active = np.zeros(batch_size, dtype=bool)
+        self.event_counts = np.zeros((batch_size, len(MATCH_EVENTS)), dtype=np.int64)
+
+        self._upper = np.triu(np.ones((NUM_PLAYERS, NUM_PLAYERS), dtype=bool), k=1)
+        self.reset(seeds, durations, formation)
+
+    def reset(self, seeds=None, durations=GAME_DURATION_SECONDS, formation=DEFAULT_FORMATION):
+        """Starts a fresh batch of matches in the existing arrays.
+
+        Takes the same arguments as the constructor, for the same batch size.
+        """
+        batch_size = self.batch_size
+        self.seeds = list(range(batch_size)) if seeds is None else list(seeds)
+        if len(self.seeds) != batch_size:
+            raise ValueError(f"Expected {batch_size} seeds, got {len(self.seeds)}")
+        self.rngs = [random.Random(seed) for seed in self.seeds]
+
+        # Team A's kickoff spots, then team B's mirrored into the other half
+        spots = [(x, y) for x, y, _ in FORMATION_LAYOUTS[formation]]
+        self._kickoff_spots = np.array(spots + [(GAME_WIDTH - x, y) for x, y in spots])
+        self.stamina.fill(100.0)
+        self.scores.fill(0)
+        self.timer.fill(0.0)
+        self.frames.fill(0)
+        self.durations[:] = durations
+        self.active.fill(True)
+        self.event_counts.fill(0)
+        self.wall_time = 0.0
+        self._reset_field(self.active)
+
+    @property
+    def num_active(self):
+        return int(self.active.sum())
+
+    def run(self, dt=1.0 / FPS):
+        """Advances the batch until every match has finished and returns the results."""
+        while self.active.any():
+            self.update(dt)
+        return self.results()
+
+    def update(self, dt):
+        """Advances every unfinished match by one frame."""
+        start = time.perf_counter()
+        active = self.active
+        self._kickoff(active)
+
+        # Player.update: friction, stamina, then integration
+        step = np.where(active, dt, 0.0)
+        player_friction = np.where(active, PLAYER_FRICTION ** (dt * FPS), 1.0)
+        self.player_vel *= player_friction[:, None, None]
+        self._update_stamina(dt)
+        self.player_pos += self.player_vel * step[:, None, None]
+
+        # Ball.update: friction, then integration
+        ball_start = self.ball_pos.copy()
+        self.ball_vel *= np.where(active, BALL_FRICTION ** (dt * FPS), 1.0)[:, None]
+        self.ball_pos += self.ball_vel * step[:, None]
+
+        self._check_collisions(active)
+        self._check_scoring(active, ball_start)
+
+        finished = active & (self.timer >= self.durations)
+        self.timer += step
+        self.frames += active
+        self.active = active & ~finished
+        self.wall_time += time.perf_counter() - start
+
+    def _update_stamina(self, dt):
+        """Manages stamina for every player in the batch."""
+        # Mirrors Player._update_stamina, which has no stamina model yet.
+        pass
+
+    def _kickoff(self, active):
+        """Puts the ball into play for every match waiting at kickoff."""
+        waiting = np.flatnonzero(active & (self.game_state == STATE_KICKOFF))
+        for b in waiting:
+            angle = self.rngs[b].uniform(0.0, 2.0 * np.pi)
+            self.ball_vel[b] = (KICKOFF_SPEED * np.cos(angle), KICKOFF_SPEED * np.sin(angle))
+        self.game_state[waiting] = STATE_IN_PLAY
+        self.event_counts[waiting, MATCH_EVENTS.index("kickoff")] += 1
+
+    def _check_collisions(self, active):
+        """Resolves player-player and ball-player contacts in every active match."""
+        collisions = MATCH_EVENTS.index("collision")
+        inv_player = 1.0 / PLAYER_WEIGHT
+        inv_ball = 1.0 / BALL_WEIGHT
+
+        # Player-player pairs, each (i, j) with i < j counted once
+        delta = self.player_pos[:, None, :, :] - self.player_pos[:, :, None, :]
+        dist_sq = np.einsum("bijd,bijd->bij", delta, delta)
+        min_distance = 2 * PLAYER_RADIUS
+        touching = (dist_sq < min_distance * min_distance) & self._upper & active[:, None, None]
+        if touching.any():
+            b, i, j = np.nonzero(touching)
+            dpos_a, dvel_a, dpos_b, dvel_b = _resolve_pairs(
+                delta[b, i, j], dist_sq[b, i, j], self.player_vel[b, i], self.player_vel[b, j],
+                inv_player, inv_player, min_distance)
+            np.add.at(self.player_pos, (b, i), dpos_a)
+            np.add.at(self.player_vel, (b, i), dvel_a)
+            np.add.at(self.player_pos, (b, j), dpos_b)
+            np.add.at(self.player_vel, (b, j), dvel_b)
+            np.add.at(self.event_counts[:, collisions], b, 1)
+
+        # Ball-player pairs: the player is body a and the ball body b, as in
+        # FootballGame, where the ball is the last body in the list.
+        delta = self.ball_pos[:, None, :] - self.player_pos
+        dist_sq = np.einsum("bpd,bpd->bp", delta, delta)
+        min_distance = PLAYER_RADIUS + BALL_RADIUS
+        touching = (dist_sq < min_distance * min_distance) & active[:, None]
+        if touching.any():
+            b, p = np.nonzero(touching)
+            dpos_a, dvel_a, dpos_b, dvel_b = _resolve_pairs(
+                delta[b, p], dist_sq[b, p], self.player_vel[b, p], self.ball_vel[b],
+                inv_player, inv_ball, min_distance)
+            np.add.at(self.player_pos, (b, p), dpos_a)
+            np.add.at(self.player_vel, (b, p), dvel_a)
+            np.add.at(self.ball_pos, b, dpos_b)
+            np.add.at(self.ball_vel, b, dvel_b)
+            np.add.at(self.event_counts[:, collisions], b, 1)
+
+    def _check_scoring(self, active, ball_start):
+        """Applies FootballGame's scoring rules to every active match.
+
+        ball_start holds the ball positions at the start of the frame.
+        """
+        goal_a, goal_b, out = classify_ball_paths(ball_start, self.ball_pos)
+        out &= active
+        if not out.any():
+            return
+        goal_a &= active
+        goal_b &= active
+        self.scores[:, 0] += goal_a
+        self.scores[:, 1] += goal_b
+        self.event_counts[:, MATCH_EVENTS.index("goal")] += goal_a | goal_b
+        self.event_counts[:, MATCH_EVENTS.index("out_of_bounds")] += out & ~(goal_a | goal_b)
+        self._reset_field(out)
+
+    def _reset_field(self, mask):
+        """Returns the ball to the centre spot and the players to their kickoff spots."""
+        self.ball_pos[mask] = (GAME_WIDTH / 2, GAME_HEIGHT / 2)
+        self.ball_vel[mask] = 0.0
+        self.player_pos[mask] = self._kickoff_spots
+        self.player_vel[mask] = 0.0
+        self.game_state[mask] = STATE_KICKOFF
+
+    def results(self):
+        """Returns one MatchResult per match in the batch.
+
+        Matches run in lockstep, so each result's wall_time is its equal
+        share of the time spent advancing the batch.
+        """
+        share = self.wall_time / self.batch_size
+        return [
+            MatchResult(int(self.scores[b, 0]), int(self.scores[b, 1]), float(self.timer[b]),
+                        int(self.frames[b]), share, self.seeds[b],
+                        dict(zip(MATCH_EVENTS, self.event_counts[b].tolist())))
+            for b in range(self.batch_size)
+        ]
+
+# ==============================================================================
+# SECTION 4: Main Execution
+# ==============================================================================
+
+if __name__ == "__main__":
+    batch = BatchedMatches(256)
+    results = batch.run()
+    print(f"Simulated {len(results)} matches in {batch.wall_time:.2f}s")
+    for result in results[:5]:
+        print(result, result.event_counts)
@@ -17,10 +17,23 @@ This module is a crucial component of our main football game project, providing
 a rich and immersive user experience.
 """
 
+import atexit
+import collections
+import itertools
 import random
+import string
+import sys
+import threading
 import time
 from datetime import datetime
 
+from football import BUS_EVENTS, NUM_PLAYERS_PER_TEAM
+
+try:
+    import numpy as np
+except ImportError:  # NumPy only speeds up drawing templates for batches
+    np = None
+
 # ==============================================================================
 # SECTION 1: Commentary Data and Templates
 # ==============================================================================
@@ -81,6 +94,7 @@ COMMENTARY_TEMPLATES = {
         "GOAL! What a stunning finish from {scorer_name}!",
         "The net bulges! A brilliant strike from {scorer_name}!",
         "That's a goal! {scorer_name} has put their team ahead!",
+        "It's in! {team_name} have found the net!",
     ],
     # ... (more templates to pad the file)
     "foul": [
@@ -127,70 +141,574 @@ COMMENTARY_TEMPLATES = {
     # ... (continue copying and pasting to pad the file)
 }
 
+# Commentary output
+COMMENTARY_QUEUE_SIZE = 4096  # Lines buffered between the simulation and the writer
+COMMENTARY_BATCH_SIZE = 512   # Lines joined into one write to the sinks
+OVERFLOW_POLICIES = ("block", "drop_oldest", "sample")
+SAMPLE_EVERY = 10             # Under the "sample" policy, keep 1 in this many lines
+
+DEFAULT_STADIUM_NAME = "City Stadium"
+UNIDENTIFIED_EVENT = "Unidentified event."
+
+# What each template placeholder needs from an event. Team and stadium names
+# are always available; the others need a player_id or a "target_player".
+SOURCE_TEAM = 1
+SOURCE_PLAYER = 2
+SOURCE_TARGET = 4
+SOURCE_STADIUM = 8
+TEMPLATE_FIELDS = {
+    "team_name": SOURCE_TEAM,
+    "player_name": SOURCE_PLAYER,
+    "scorer_name": SOURCE_PLAYER,
+    "target_player": SOURCE_TARGET,
+    "stadium_name": SOURCE_STADIUM,
+}
+
 # ==============================================================================
 # SECTION 2: Core Commentary Classes
 # ==============================================================================
 
 class CommentaryEvent:
     """A data class to represent an in-game event for commentary generation."""
-    def __init__(self, event_type, team_id, player_id=None, other_params=None):
+    def __init__(self, event_type, team_id, player_id=None, other_params=None, timestamp=None):
         self.event_type = event_type
         self.team_id = team_id
         self.player_id = player_id
-        self.timestamp = datetime.now()
+        self.timestamp = datetime.now() if timestamp is None else timestamp
         self.other_params = other_params or {}
 
+def commentary_events(cursor, team_keys):
+    """Yields a CommentaryEvent for each event waiting on a football.EventBus cursor.
+
+    team_keys maps the game's team ids (1 and 2) to TEAM_NAMES keys. The
+    event's timestamp is its simulated time in seconds.
+    """
+    for event_type, team_id, player, sim_time, param_a, _ in cursor.poll():
+        event_type = BUS_EVENTS[event_type]
+        other_params = {"target_player": int(param_a)} if event_type == "pass" else None
+        yield CommentaryEvent(event_type, team_keys.get(team_id), None if player < 0 else player,
+                              other_params, sim_time)
+
+class CommentaryTemplate:
+    """A commentary template parsed once into the fields it needs.
+
+    Raises ValueError for a placeholder that is not in TEMPLATE_FIELDS, so
+    a template that could never be filled is caught when it is compiled
+    rather than showing up as a raw "{placeholder}" in the commentary.
+    """
+    __slots__ = ("text", "fields", "sources", "format_fields")
+
+    def __init__(self, text):
+        fields = []
+        positional = []  # The template with each field replaced by its position
+        for literal, field, spec, conversion in string.Formatter().parse(text):
+            positional.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            if field not in TEMPLATE_FIELDS:
+                raise ValueError(f"Unknown placeholder {{{field}}} in commentary template {text!r}")
+            if field not in fields:
+                fields.append(field)
+            positional.append("{%d%s%s}" % (fields.index(field),
+                                            "!" + conversion if conversion else "",
+                                            ":" + spec if spec else ""))
+        self.text = text
+        self.fields = tuple(fields)
+        self.sources = 0
+        for field in fields:
+            self.sources |= TEMPLATE_FIELDS[field]
+        # format_fields(*values) takes one value per entry of fields, in order
+        self.format_fields = "".join(positional).format
+
+    def __repr__(self):
+        return f"CommentaryTemplate({self.text!r})"
+
+class NameRegistry:
+    """An interned table of unique player names and the squads drawn from it.
+
+    Each name is stored once, however often it appears in the source list,
+    and squads refer to the same string objects, so a registry of tens of
+    thousands of players costs one string per name and a lookup is a plain
+    tuple index.
+    """
+    def __init__(self, names=(), squad_size=NUM_PLAYERS_PER_TEAM):
+        self.names = []
+        self.squad_size = squad_size
+        self._slots = {}   # Name -> its index in names
+        self._squads = {}  # Team key -> tuple of squad_size names
+        for name in names:
+            self.add(name)
+
+    def add(self, name):
+        """Adds name if it is new and returns its slot."""
+        slot = self._slots.get(name)
+        if slot is None:
+            name = sys.intern(name)
+            slot = self._slots[name] = len(self.names)
+            self.names.append(name)
+        return slot
+
+    def bind_squad(self, team_key, names):
+        """Gives team_key a squad of the given names, in shirt order."""
+        squad = tuple(self.names[self.add(name)] for name in names)
+        if len(squad) != self.squad_size:
+            raise ValueError(f"A squad needs {self.squad_size} names, got {len(squad)}")
+        if len(set(squad)) != len(squad):
+            raise ValueError(f"Squad for {team_key!r} names a player twice")
+        self._squads[team_key] = squad
+        return squad
+
+    def squad(self, team_key):
+        """Returns the names of team_key's players, assigning them on first use.
+
+        Teams without a bound squad get the next squad_size names of the
+        registry, so squads only share names once the registry runs out;
+        match_roster keeps shared names apart within a match.
+        """
+        squad = self._squads.get(team_key)
+        if squad is None:
+            if len(self.names) < self.squad_size:
+                raise ValueError(f"The name registry has fewer than {self.squad_size} names")
+            start = len(self._squads) * self.squad_size
+            squad = self._squads[team_key] = tuple(
+                self.names[(start + i) % len(self.names)] for i in range(self.squad_size))
+        return squad
+
+    def match_roster(self, home, away):
+        """Returns the names of the home squad followed by the away squad.
+
+        An away player whose name is also in the home squad is given the
+        first registry name that neither squad uses, so no two players on
+        the pitch share a name. Squads themselves are left unchanged.
+        """
+        home_squad, away_squad = self.squad(home), self.squad(away)
+        clashes = set(home_squad).intersection(away_squad)
+        if not clashes:
+            return home_squad + away_squad
+        if len(self.names) < 2 * self.squad_size:
+            raise ValueError(f"Two squads need {2 * self.squad_size} different names, "
+                             f"the registry has {len(self.names)}")
+        taken = set(home_squad).union(away_squad)
+        spare = (name for name in self.names if name not in taken)
+        return home_squad + tuple(next(spare) if name in clashes else name
+                                  for name in away_squad)
+
+    def __len__(self):
+        return len(self.names)
+
+    def __repr__(self):
+        return f"NameRegistry({len(self.names)} names, {len(self._squads)} squads)"
+
+# Shared, so that a club fields the same squad in every match
+PLAYER_REGISTRY = NameRegistry(PLAYER_NAMES)
+
+def compile_templates(templates):
+    """Compiles a dictionary of event type -> template texts into CommentaryTemplates."""
+    return {event_type: [CommentaryTemplate(text) for text in texts]
+            for event_type, texts in templates.items()}
+
 class CommentaryGenerator:
     """Generates the actual commentary text based on events."""
-    def __init__(self, team_names, player_names, templates):
+    def __init__(self, team_names, player_names, templates, stadium_name=DEFAULT_STADIUM_NAME,
+                 compiled=None):
+        """Compiles every template up front; see CommentaryTemplate.
+
+        player_names is a NameRegistry or a list of names to build one from.
+        Until bind_match is called, player ids index the registry directly.
+        compiled, if given, is compile_templates(templates) shared with other
+        generators, so that many generators compile the templates only once.
+        """
         self.team_names = team_names
+        if not isinstance(player_names, NameRegistry):
+            player_names = NameRegistry(player_names)
         self.player_names = player_names
+        self.roster = tuple(player_names.names)
+        self.match = None
         self.templates = templates
+        self.stadium_name = stadium_name
+        self.compiled = compile_templates(templates) if compiled is None else compiled
+        field_getters = {
+            "team_name": self._team_name,
+            "player_name": self._player_name,
+            "scorer_name": self._player_name,
+            "target_player": self._target_name,
+            "stadium_name": self._stadium_name,
+        }
+        self._getters = {template: tuple(field_getters[field] for field in template.fields)
+                         for compiled in self.compiled.values() for template in compiled}
+        self._choices = {}  # (event_type, available sources) -> templates that can be filled
+        self._batch_rng = None
+
+    def bind_match(self, home, away):
+        """Fixes the names of a match's players, before its kickoff.
+
+        Player ids then index the home squad followed by the away squad, in
+        the order of FootballGame.bodies, so naming a player on each event
+        is a single lookup however large the registry is. See
+        NameRegistry.match_roster for squads that share names.
+        """
+        if self.match != (home, away):
+            self.roster = self.player_names.match_roster(home, away)
+            self.match = (home, away)
 
     def get_commentary(self, event):
-        """Selects and formats a commentary line for a given event."""
-        if event.event_type in self.templates:
-            template = random.choice(self.templates[event.event_type])
-            return self._format_template(template, event)
-        return "Unidentified event."
+        """Selects and formats a commentary line for a given event.
 
-    def _format_template(self, template, event):
-        """Replaces placeholders in the template with dynamic data."""
-        # This function would be a complex string formatting engine
-        # For the decoy, we'll keep it simple but structured.
-        formatted_commentary = template
-        
-        # Replace placeholders for teams
-        team_name = self.team_names.get(event.team_id, "Unknown Team")
-        formatted_commentary = formatted_commentary.replace("{team_name}", team_name)
-        
-        # Replace placeholders for players
+        Only templates the event has the data for are considered, e.g. a
+        pass without a target_player never picks a "{target_player}" line.
+        """
+        choices = self._templates_for(event)
+        if not choices:
+            return UNIDENTIFIED_EVENT
+        return self._format_template(random.choice(choices), event)
+
+    def get_commentary_batch(self, events):
+        """Returns one commentary line per event, in the same order.
+
+        Events are grouped by the templates they can use and the template
+        indices for a whole group are drawn in one call, instead of one
+        random.choice per event.
+        """
+        events = list(events)
+        lines = [UNIDENTIFIED_EVENT] * len(events)
+        groups = {}  # (event_type, available sources) -> positions of its events
+        for i, event in enumerate(events):
+            # Same test as _templates_for, inlined as it runs once per event
+            available = SOURCE_TEAM | SOURCE_STADIUM
+            if event.player_id is not None:
+                available |= SOURCE_PLAYER
+            if "target_player" in event.other_params:
+                available |= SOURCE_TARGET
+            key = (event.event_type, available)
+            positions = groups.get(key)
+            if positions is None:
+                groups[key] = [i]
+            else:
+                positions.append(i)
+
+        getters = self._getters
+        for (event_type, available), positions in groups.items():
+            choices = self._choices_for(event_type, available)
+            if not choices:
+                continue
+            formatters = []
+            for template in choices:
+                fields = getters[template]
+                # Templates without fields always produce the same line
+                formatters.append((template.format_fields, fields) if fields
+                                  else (None, template.format_fields()))
+            for i, pick in zip(positions, self._draw(len(choices), len(positions))):
+                format_fields, fields = formatters[pick]
+                if format_fields is None:
+                    lines[i] = fields
+                else:
+                    event = events[i]
+                    lines[i] = format_fields(*[get(event) for get in fields])
+        return lines
+
+    def stream(self, events_iter, chunk_size=COMMENTARY_BATCH_SIZE):
+        """Lazily yields a commentary line for each event of an iterable.
+
+        Events are taken chunk_size at a time and voiced with
+        get_commentary_batch, so even an endless stream of events is handled
+        in bounded memory.
+        """
+        events_iter = iter(events_iter)
+        while True:
+            chunk = list(itertools.islice(events_iter, chunk_size))
+            if not chunk:
+                return
+            yield from self.get_commentary_batch(chunk)
+
+    def _draw(self, choices, count):
+        """Draws count template indices below choices in a single RNG call."""
+        if choices == 1:
+            return itertools.repeat(0, count)
+        if np is None:
+            return random.choices(range(choices), k=count)
+        if self._batch_rng is None:
+            # Seeded from the random module on first use, so random.seed()
+            # before a generator's first batch makes its batches repeatable
+            self._batch_rng = np.random.default_rng(random.getrandbits(64))
+        return self._batch_rng.integers(0, choices, size=count).tolist()
+
+    def _templates_for(self, event):
+        """Returns the compiled templates of event's type that event can fill."""
+        available = SOURCE_TEAM | SOURCE_STADIUM
         if event.player_id is not None:
-            player_name = self.player_names[event.player_id % len(self.player_names)]
-            formatted_commentary = formatted_commentary.replace("{player_name}", player_name)
-            
-        # Replace placeholders for other players (e.g., target_player)
+            available |= SOURCE_PLAYER
         if "target_player" in event.other_params:
-            target_player_id = event.other_params["target_player"]
-            target_player_name = self.player_names[target_player_id % len(self.player_names)]
-            formatted_commentary = formatted_commentary.replace("{target_player}", target_player_name)
-            
-        # Add other potential placeholders here...
-        
-        return formatted_commentary
+            available |= SOURCE_TARGET
+        return self._choices_for(event.event_type, available)
+
+    def _choices_for(self, event_type, available):
+        """Returns the templates of event_type that need no more than the available sources."""
+        key = (event_type, available)
+        choices = self._choices.get(key)
+        if choices is None:
+            choices = self._choices[key] = [
+                template for template in self.compiled.get(event_type, ())
+                if template.sources & ~available == 0]
+        return choices
+
+    def _format_template(self, template, event):
+        """Fills a compiled template with the names the event refers to."""
+        return template.format_fields(*[get(event) for get in self._getters[template]])
+
+    def _team_name(self, event):
+        return self.team_names.get(event.team_id, "Unknown Team")
+
+    def _player_name(self, event):
+        return self.roster[event.player_id]
+
+    def _target_name(self, event):
+        return self.roster[event.other_params["target_player"]]
+
+    def _stadium_name(self, event):
+        return event.other_params.get("stadium_name", self.stadium_name)
+
+class StdoutSink:
+    """Writes commentary to standard output."""
+    def write(self, text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    def close(self):
+        pass
+
+class FileSink:
+    """Appends commentary to a text file."""
+    def __init__(self, path):
+        self.file = open(path, "a", encoding="utf-8")
+
+    def write(self, text):
+        self.file.write(text)
+        self.file.flush()
+
+    def close(self):
+        self.file.close()
+
+class SocketSink:
+    """Sends commentary as UTF-8 text over a connected socket."""
+    def __init__(self, sock):
+        self.sock = sock
+
+    def write(self, text):
+        self.sock.sendall(text.encode("utf-8"))
+
+    def close(self):
+        self.sock.close()
+
+class MemorySink:
+    """Keeps the most recent commentary lines in memory, e.g. for tests or a UI."""
+    def __init__(self, max_lines=None):
+        self.lines = collections.deque(maxlen=max_lines)
+
+    def write(self, text):
+        self.lines.extend(text.splitlines())
+
+    def close(self):
+        pass
+
+def format_match_time(seconds):
+    """Formats a simulated match time as MM:SS.s."""
+    minutes, seconds = divmod(seconds, 60)
+    return f"{int(minutes):02d}:{seconds:04.1f}"
+
+class CommentaryWriter:
+    """Feeds commentary lines to sinks from a background thread.
+
+    emit() only appends to a bounded queue, so it costs the caller next to
+    nothing. The writer thread takes up to batch_size lines at a time,
+    formats their timestamps (taken from time.monotonic() at emit time and
+    formatted once per wall-clock second) and hands each sink one joined
+    write. A line emitted with a match_time also shows that time, as
+    minutes and seconds of play. When the queue is full, policy decides
+    what happens:
+
+    * "block"       - emit() waits for room; no line is lost
+    * "drop_oldest" - the oldest queued line is discarded for the new one
+    * "sample"      - only one new line in SAMPLE_EVERY is queued, in place
+                      of the oldest, until the writer catches up
+
+    Lines that are discarded are counted in dropped. A sink whose write
+    raises is counted in errors and moved to failed_sinks, and the other
+    sinks carry on without it.
+    """
+    def __init__(self, sinks, max_queue=COMMENTARY_QUEUE_SIZE, policy="block",
+                 batch_size=COMMENTARY_BATCH_SIZE):
+        if policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {policy!r}")
+        self.sinks = list(sinks)
+        self.max_queue = max_queue
+        self.policy = policy
+        self.batch_size = batch_size
+        self.emitted = 0
+        self.written = 0
+        self.dropped = 0
+        self.errors = 0
+        self.failed_sinks = []
+        self._queue = collections.deque()
+        self._condition = threading.Condition()
+        self._overflowing = 0
+        self._closed = False
+        self._busy = False
+        self._stopped = False
+        # Monotonic timestamps are turned into wall-clock time on the writer thread
+        self._wall_offset = time.time() - time.monotonic()
+        self._stamp_second = None
+        self._stamp = ""
+        self._thread = threading.Thread(target=self._run, name="commentary-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def emit(self, speaker, text, match_time=None):
+        """Queues one line of commentary from speaker.
+
+        match_time, if given, is the simulated time of the event in seconds.
+        """
+        entry = (time.monotonic(), speaker, text, match_time)
+        with self._condition:
+            if self._closed:
+                raise ValueError("Commentary writer is closed")
+            if self._stopped or not self._thread.is_alive():
+                raise RuntimeError("Commentary writer thread has stopped")
+            queue = self._queue
+            if len(queue) >= self.max_queue:
+                if self.policy == "block":
+                    while len(queue) >= self.max_queue and not self._closed:
+                        if self._stopped:
+                            raise RuntimeError("Commentary writer thread has stopped")
+                        self._condition.wait()
+                else:
+                    self._overflowing += 1
+                    if self.policy == "sample" and self._overflowing % SAMPLE_EVERY:
+                        self.dropped += 1
+                        return
+                    queue.popleft()
+                    self.dropped += 1
+            else:
+                self._overflowing = 0
+            queue.append(entry)
+            self.emitted += 1
+            self._condition.notify_all()
+
+    def flush(self):
+        """Waits until every queued line has been written to the sinks."""
+        with self._condition:
+            while (self._queue or self._busy) and self._thread.is_alive():
+                self._condition.wait()
+
+    def close(self):
+        """Writes what is still queued, stops the writer and closes the sinks."""
+        with self._condition:
+            if self._closed:
+                return
+            self._closed = True
+            self._condition.notify_all()
+        self._thread.join()
+        for sink in self.sinks + self.failed_sinks:
+            sink.close()
+        atexit.unregister(self.close)
+
+    def _run(self):
+        try:
+            self._write_batches()
+        finally:
+            # However the loop ends, never leave flush() or a blocked emit() waiting
+            with self._condition:
+                self._busy = False
+                self._stopped = True
+                self._condition.notify_all()
+
+    def _write_batches(self):
+        queue, condition = self._queue, self._condition
+        while True:
+            with condition:
+                while not queue and not self._closed:
+                    condition.wait()
+                if not queue:
+                    return
+                batch = [queue.popleft() for _ in range(min(self.batch_size, len(queue)))]
+                self._busy = True
+                condition.notify_all()  # Wake producers blocked on a full queue
+            try:
+                text = "".join(
+                    f"[{self._timestamp(t)}] {speaker}: {line}\n" if match_time is None else
+                    f"[{self._timestamp(t)}] [{format_match_time(match_time)}] {speaker}: {line}\n"
+                    for t, speaker, line, match_time in batch)
+                for sink in list(self.sinks):
+                    try:
+                        sink.write(text)
+                    except Exception as error:
+                        self._disable_sink(sink, error)
+            finally:
+                with condition:
+                    self.written += len(batch)
+                    self._busy = False
+                    condition.notify_all()
+
+    def _disable_sink(self, sink, error):
+        """Stops writing to a sink that raised, reporting it once on stderr."""
+        self.errors += 1
+        self.sinks.remove(sink)
+        self.failed_sinks.append(sink)
+        print(f"Commentary sink {type(sink).__name__} failed and was disabled: {error!r}",
+              file=sys.stderr)
+
+    def _timestamp(self, monotonic_time):
+        """Formats a monotonic time as wall-clock HH:MM:SS, reusing the last string."""
+        second = int(monotonic_time + self._wall_offset)
+        if second != self._stamp_second:
+            self._stamp_second = second
+            self._stamp = time.strftime("%H:%M:%S", time.localtime(second))
+        return self._stamp
 
 class CommentaryEngine:
     """The main engine for the commentary system."""
-    def __init__(self):
-        self.generator = CommentaryGenerator(TEAM_NAMES, PLAYER_NAMES, COMMENTARY_TEMPLATES)
+    def __init__(self, sinks=None, max_queue=COMMENTARY_QUEUE_SIZE, policy="block"):
+        """Creates an engine writing to sinks (standard output by default).
+
+        Output goes through a CommentaryWriter, so generating commentary
+        never waits on I/O unless policy is "block" and the queue is full.
+        """
+        self.generator = CommentaryGenerator(TEAM_NAMES, PLAYER_REGISTRY, COMMENTARY_TEMPLATES)
         self.commentators = ["Main Commentator", "Analyst"]
+        self.writer = CommentaryWriter(sinks or [StdoutSink()], max_queue, policy)
         
-    def generate_commentary_for_event(self, event):
-        """Processes an event and generates commentary."""
+    def generate_commentary_for_event(self, event, match_time=None):
+        """Processes an event and generates commentary.
+
+        match_time, if given, is logged next to the wall-clock time; see
+        CommentaryWriter.emit.
+        """
         commentary = self.generator.get_commentary(event)
-        
-        # Simulate commentary output
-        print(f"[{datetime.now().strftime('%H:%M:%S')}] {random.choice(self.commentators)}: {commentary}")
+        self.writer.emit(random.choice(self.commentators), commentary, match_time)
+
+    def consume(self, cursor, team_keys):
+        """Generates commentary for every event waiting on an EventBus cursor.
+
+        team_keys maps team ids 1 and 2 to the home and away TEAM_NAMES keys,
+        whose squads name the players. Each line is logged with the event's
+        simulated time. Events without commentary templates (such as
+        out_of_bounds) are skipped.
+        """
+        self.generator.bind_match(team_keys[1], team_keys[2])
+        for event in commentary_events(cursor, team_keys):
+            if event.event_type in self.generator.compiled:
+                self.generate_commentary_for_event(event, event.timestamp)
+
+    def flush(self):
+        self.writer.flush()
+
+    def close(self):
+        self.writer.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
 
 # ==============================================================================
 # SECTION 3: Main Execution (Simulated)
@@ -213,6 +731,7 @@ if __name__ == "__main__":
     for event in simulated_events:
         commentary_engine.generate_commentary_for_event(event)
         time.sleep(1) # Pause to simulate a real-time event flow
+    commentary_engine.close()
 
 # --- Placeholder to pad the file to 1000 lines ---
 # This is where we add repetitive, structured dummy code to reach the line count.
@@ -0,0 +1,278 @@
+# football_host.py
+
+"""
+Asyncio Live Match Host
+=======================
+
+Runs many real-time FootballGame matches as tasks on one asyncio event loop,
+instead of one blocking ``run()`` per process. Each match keeps its own
+FrameScheduler, driven by the loop's clock, and awaits the rest of its frame
+budget instead of calling ``time.sleep``, so hundreds of matches share one
+thread.
+
+Frames and commentary lines are published as newline-delimited JSON to
+subscribers connected over a local TCP or Unix socket. A client subscribes
+by sending one line: a match id, or ``*`` for every match. Each message is
+serialized once and shared by all subscribers. Every subscriber has its own
+bounded queue drained by its own writer task; when a client reads too slowly
+its queue fills up and its oldest messages are dropped, so a slow consumer
+only ever loses its own frames and never stalls the simulation.
+"""
+
+import asyncio
+import collections
+import json
+
+from football import FPS, SIMULATION_STEPS_PER_FRAME, EventBus, FootballGame, FrameScheduler
+from football_commentary_module import (
+    COMMENTARY_TEMPLATES,
+    PLAYER_REGISTRY,
+    TEAM_NAMES,
+    CommentaryGenerator,
+    commentary_events,
+    compile_templates,
+)
+
+# ==============================================================================
+# SECTION 1: Host Constants
+# ==============================================================================
+
+SUBSCRIBER_QUEUE_SIZE = 256  # Messages buffered per client before the oldest are dropped
+ALL_MATCHES = "*"
+COMPILED_TEMPLATES = compile_templates(COMMENTARY_TEMPLATES)  # Shared by every LiveMatch
+
+# ==============================================================================
+# SECTION 2: Subscribers and Live Matches
+# ==============================================================================
+
+def encode_message(message):
+    """Serializes one message as a line of JSON."""
+    return json.dumps(message, separators=(",", ":")).encode() + b"\n"
+
+class Subscriber:
+    """One connected client with its own bounded outgoing queue."""
+    def __init__(self, writer, topic, max_queue=SUBSCRIBER_QUEUE_SIZE):
+        self.writer = writer
+        self.topic = topic
+        self.queue = collections.deque()
+        self.max_queue = max_queue
+        self.sent = 0
+        self.dropped = 0
+        self.closed = False
+        self._ready = asyncio.Event()  # Set when there is data to write or the stream ended
+
+    def offer(self, data):
+        """Queues data without ever blocking, dropping the oldest message if full.
+
+        Data offered after close() is ignored.
+        """
+        if self.closed:
+            return
+        if len(self.queue) >= self.max_queue:
+            self.queue.popleft()
+            self.dropped += 1
+        self.queue.append(data)
+        self._ready.set()
+
+    def close(self):
+        """Ends the stream once everything already queued has been written."""
+        self.closed = True
+        self._ready.set()
+
+    async def pump(self):
+        """Writes queued messages to the client until the stream is closed."""
+        queue, writer = self.queue, self.writer
+        while True:
+            await self._ready.wait()
+            self._ready.clear()
+            if queue:  # Coalesce everything that is waiting into one write
+                chunks = list(queue)
+                queue.clear()
+                writer.write(b"".join(chunks))
+                await writer.drain()
+                self.sent += len(chunks)
+            if self.closed and not queue:
+                return
+
+class LiveMatch:
+    """A FootballGame played in real time as an asyncio task."""
+    def __init__(self, match_id, home, away, seed=None, speed=1.0, publish_every=1,
+                 substeps=SIMULATION_STEPS_PER_FRAME, adaptive=True):
+        """Creates a match between the TEAM_NAMES keys home and away.
+
+        speed scales the pace against the wall clock (2.0 plays at double
+        speed). A frame is published every publish_every frames. substeps
+        and adaptive are passed on to the game's frame loop; adaptive
+        stepping keeps the CPU cost per match low enough to host hundreds.
+        """
+        self.match_id = match_id
+        self.home = home
+        self.away = away
+        self.events = EventBus()
+        self.game = FootballGame(seed=seed, event_bus=self.events)
+        self.speed = speed
+        self.publish_every = publish_every
+        self.substeps = substeps
+        self.adaptive = adaptive
+        self.scheduler = None
+        self.commentary = CommentaryGenerator(TEAM_NAMES, PLAYER_REGISTRY, COMMENTARY_TEMPLATES,
+                                              compiled=COMPILED_TEMPLATES)
+        self.task = None
+        self._commentary_cursor = self.events.subscribe()
+
+    async def play(self, publish):
+        """Plays the match to full time, calling publish(match_id, message) as it goes."""
+        loop = asyncio.get_running_loop()
+        game = self.game
+        dt = 1.0 / FPS
+        self.scheduler = scheduler = FrameScheduler(FPS * self.speed, clock=loop.time)
+        self.commentary.bind_match(self.home, self.away)
+        scheduler.start()
+        while game.is_running:
+            for _ in range(scheduler.frames_due()):
+                game._advance_frame(dt, self.substeps, self.adaptive)
+                game.timer += dt
+                scheduler.frame_done()
+                self._publish_commentary(publish)
+                if scheduler.frames % self.publish_every == 0:
+                    publish(self.match_id, self.frame_message())
+                if not game.is_running:
+                    break
+            await asyncio.sleep(scheduler.time_to_next_frame())
+        publish(self.match_id, {"type": "full_time", "match": self.match_id,
+                                "score": [game.team_a.score, game.team_b.score]})
+
+    def frame_message(self):
+        """Returns the current state of the match as a frame message."""
+        game = self.game
+        ball = game.ball.position
+        return {
+            "type": "frame",
+            "match": self.match_id,
+            "time": round(game.timer, 3),
+            "score": [game.team_a.score, game.team_b.score],
+            "ball": [round(ball.x, 1), round(ball.y, 1)],
+            "players": [[round(p.position.x, 1), round(p.position.y, 1)]
+                        for p in game.bodies[:-1]],
+        }
+
+    def _publish_commentary(self, publish):
+        """Publishes a commentary line for each match event since the last frame."""
+        team_keys = {self.game.team_a.team_id: self.home, self.game.team_b.team_id: self.away}
+        for event in commentary_events(self._commentary_cursor, team_keys):
+            if event.event_type not in self.commentary.compiled:
+                continue
+            publish(self.match_id, {"type": "commentary", "match": self.match_id,
+                                    "time": round(event.timestamp, 3),
+                                    "text": self.commentary.get_commentary(event)})
+
+# ==============================================================================
+# SECTION 3: Match Host
+# ==============================================================================
+
+class MatchHost:
+    """Hosts live matches on the running event loop and serves them to subscribers."""
+    def __init__(self, max_queue=SUBSCRIBER_QUEUE_SIZE):
+        self.max_queue = max_queue
+        self.matches = {}
+        self.subscribers = {}  # Topic (match id or ALL_MATCHES) -> set of Subscribers
+        self.messages_published = 0
+        self._clients = set()
+
+    def add_match(self, home, away, seed=None, **options):
+        """Adds a match and returns its id. options are passed to LiveMatch.
+
+        Matches added while the host is running start straight away.
+        """
+        match_id = str(len(self.matches))
+        match = self.matches[match_id] = LiveMatch(match_id, home, away, seed, **options)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return match_id  # Started by play_all()
+        match.task = asyncio.create_task(match.play(self.publish))
+        return match_id
+
+    def publish(self, match_id, message):
+        """Serializes message once and offers it to every interested subscriber."""
+        targets = self.subscribers.get(match_id, ()), self.subscribers.get(ALL_MATCHES, ())
+        if not targets[0] and not targets[1]:
+            return
+        data = encode_message(message)
+        for group in targets:
+            for subscriber in group:
+                subscriber.offer(data)
+        self.messages_published += 1
+
+    async def play_all(self):
+        """Plays every match that has not started yet and waits for all of them."""
+        for match in self.matches.values():
+            if match.task is None:
+                match.task = asyncio.create_task(match.play(self.publish))
+        await asyncio.gather(*(match.task for match in self.matches.values()))
+
+    async def serve_tcp(self, host="127.0.0.1", port=0):
+        """Starts accepting subscribers on a TCP socket and returns the server."""
+        return await asyncio.start_server(self._handle_client, host, port)
+
+    async def serve_unix(self, path):
+        """Starts accepting subscribers on a Unix domain socket and returns the server."""
+        return await asyncio.start_unix_server(self._handle_client, path)
+
+    async def close(self):
+        """Flushes and disconnects every subscriber."""
+        for group in self.subscribers.values():
+            for subscriber in group:
+                subscriber.close()
+        await asyncio.gather(*self._clients, return_exceptions=True)
+
+    def stats(self):
+        """Returns per-match frame telemetry and per-client delivery counts."""
+        return {
+            "messages_published": self.messages_published,
+            "matches": {match_id: match.scheduler.stats() if match.scheduler else None
+                        for match_id, match in self.matches.items()},
+            "subscribers": [{"topic": s.topic, "sent": s.sent, "dropped": s.dropped}
+                            for group in self.subscribers.values() for s in group],
+        }
+
+    async def _handle_client(self, reader, writer):
+        """Reads the client's subscription line, then streams messages to it."""
+        topic = (await reader.readline()).decode().strip() or ALL_MATCHES
+        subscriber = Subscriber(writer, topic, self.max_queue)
+        group = self.subscribers.setdefault(topic, set())
+        group.add(subscriber)
+        task = asyncio.current_task()
+        self._clients.add(task)
+        try:
+            await subscriber.pump()
+        except ConnectionError:
+            pass  # The client went away
+        finally:
+            group.discard(subscriber)
+            self._clients.discard(task)
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+# ==============================================================================
+# SECTION 4: Main Execution
+# ==============================================================================
+
+async def _main(num_matches=100, port=8765):
+    host = MatchHost()
+    clubs = list(TEAM_NAMES)
+    for i in range(num_matches):
+        host.add_match(clubs[(2 * i) % len(clubs)], clubs[(2 * i + 1) % len(clubs)], seed=i,
+                       publish_every=6)
+    server = await host.serve_tcp(port=port)
+    print(f"Hosting {num_matches} matches on port {port}; send a match id or * to subscribe")
+    async with server:
+        await host.play_all()
+        print(json.dumps(host.stats()["subscribers"], indent=2))
+        await host.close()
+
+if __name__ == "__main__":
+    asyncio.run(_main())
@@ -0,0 +1,291 @@
+# football_league.py
+
+"""
+Football League Runner
+======================
+
+Plays full double round-robin seasons (every club at home and away to every
+other) between the clubs in ``football_commentary_module.TEAM_NAMES``, using
+headless FootballGame matches with the home side as team A.
+
+Fixtures are handed to a pool of worker processes in small chunks, and only
+a bounded number of chunks is in flight at once: a worker that finishes
+early simply pulls the next chunk, so the load balances itself without any
+up-front partitioning. Results stream back as compact (fixture, goals)
+tuples and are folded into a Standings table as they arrive. When many
+seasons are simulated for title odds, each season's table is dropped as
+soon as its last fixture is in, so memory stays constant however many
+seasons are run.
+"""
+
+import os
+import random
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from football import GAME_DURATION_SECONDS, FootballGame
+from football_commentary_module import TEAM_NAMES
+
+# ==============================================================================
+# SECTION 1: Fixtures and Standings
+# ==============================================================================
+
+POINTS_FOR_WIN = 3
+POINTS_FOR_DRAW = 1
+CHUNKS_IN_FLIGHT_PER_WORKER = 2
+
+def round_robin(teams):
+    """Returns a double round-robin as a list of rounds of (home, away) pairs.
+
+    Uses the circle method: one team stays fixed while the others rotate,
+    so every team plays once per round. The second half of the season
+    repeats the first with home and away swapped. An odd number of teams
+    gets a bye each round.
+    """
+    teams = list(teams)
+    if len(teams) % 2:
+        teams.append(None)  # Bye
+    count = len(teams)
+    rounds = []
+    for r in range(count - 1):
+        pairs = []
+        for i in range(count // 2):
+            home, away = teams[i], teams[count - 1 - i]
+            if home is None or away is None:
+                continue
+            if (i == 0 and r % 2) or (i > 0 and i % 2):
+                home, away = away, home  # Alternate home games
+            pairs.append((home, away))
+        rounds.append(pairs)
+        teams.insert(1, teams.pop())
+    return rounds + [[(away, home) for home, away in pairs] for pairs in rounds]
+
+class Standings:
+    """A league table that is updated one result at a time."""
+    COLUMNS = ("played", "won", "drawn", "lost", "goals_for", "goals_against", "points")
+
+    def __init__(self, teams, rng=None):
+        """Creates an empty table for teams.
+
+        Teams level on points, goal difference and goals scored are
+        separated by drawing lots, which rng (a random.Random) decides.
+        """
+        self.rows = {team: dict.fromkeys(self.COLUMNS, 0) for team in teams}
+        lots = list(self.rows)
+        (rng or random.Random(0)).shuffle(lots)
+        self._lots = {team: i for i, team in enumerate(lots)}
+        self.matches = 0
+
+    def record(self, home, away, home_goals, away_goals):
+        """Adds one result to the table."""
+        for team, scored, conceded in ((home, home_goals, away_goals),
+                                       (away, away_goals, home_goals)):
+            row = self.rows[team]
+            row["played"] += 1
+            row["goals_for"] += scored
+            row["goals_against"] += conceded
+            if scored > conceded:
+                row["won"] += 1
+                row["points"] += POINTS_FOR_WIN
+            elif scored == conceded:
+                row["drawn"] += 1
+                row["points"] += POINTS_FOR_DRAW
+            else:
+                row["lost"] += 1
+        self.matches += 1
+
+    def table(self):
+        """Returns the teams in league order."""
+        def key(team):
+            row = self.rows[team]
+            return (-row["points"], row["goals_against"] - row["goals_for"],
+                    -row["goals_for"], self._lots[team])
+        return sorted(self.rows, key=key)
+
+    def __str__(self):
+        lines = [f"{'':>3} {'Team':<14}  P  W  D  L  GF  GA  Pts"]
+        for position, team in enumerate(self.table(), 1):
+            row = self.rows[team]
+            lines.append(f"{position:>3} {TEAM_NAMES.get(team, team):<14} "
+                         f"{row['played']:>2} {row['won']:>2} {row['drawn']:>2} {row['lost']:>2} "
+                         f"{row['goals_for']:>3} {row['goals_against']:>3} {row['points']:>4}")
+        return "\n".join(lines)
+
+# ==============================================================================
+# SECTION 2: Fixture Pool
+# ==============================================================================
+
+def _play_fixtures(jobs, backend, duration):
+    """Plays (key, seed) jobs and returns (key, home_goals, away_goals) tuples.
+
+    Executed inside a worker process. Only the last duration seconds of
+    each match are played, as in the benchmarks.
+    """
+    game = FootballGame(backend)
+    results = []
+    for key, seed in jobs:
+        game.reset(seed)
+        game.timer = GAME_DURATION_SECONDS - duration
+        game.run(realtime=False, render_every=None, adaptive=True)
+        results.append((key, game.team_a.score, game.team_b.score))
+    return results
+
+def play_fixtures(jobs, workers=None, chunk_size=8, backend="objects",
+                  duration=GAME_DURATION_SECONDS):
+    """Plays an iterable of (key, seed) jobs and yields (key, home_goals, away_goals).
+
+    jobs is consumed lazily: at most CHUNKS_IN_FLIGHT_PER_WORKER chunks of
+    chunk_size jobs per worker are submitted at once, and the next chunk is
+    submitted whenever one completes, so idle workers always pick up the
+    remaining work. Results are yielded in completion order. workers
+    defaults to os.cpu_count(); 1 plays everything in-process.
+    """
+    workers = workers or os.cpu_count() or 1
+    jobs = iter(jobs)
+
+    def next_chunk():
+        chunk = []
+        for job in jobs:
+            chunk.append(job)
+            if len(chunk) == chunk_size:
+                break
+        return chunk
+
+    if workers == 1:
+        while True:
+            chunk = next_chunk()
+            if not chunk:
+                return
+            yield from _play_fixtures(chunk, backend, duration)
+
+    executor = ProcessPoolExecutor(max_workers=workers)
+    try:
+        pending = set()
+        while True:
+            while len(pending) < workers * CHUNKS_IN_FLIGHT_PER_WORKER:
+                chunk = next_chunk()
+                if not chunk:
+                    break
+                pending.add(executor.submit(_play_fixtures, chunk, backend, duration))
+            if not pending:
+                return
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+# ==============================================================================
+# SECTION 3: Leagues and Seasons
+# ==============================================================================
+
+class SeasonSummary:
+    """Streaming totals over many simulated seasons."""
+    def __init__(self, teams):
+        self.teams = list(teams)
+        self.seasons = 0
+        self.titles = dict.fromkeys(self.teams, 0)
+        self.positions = {team: [0] * len(self.teams) for team in self.teams}
+        self.total_points = dict.fromkeys(self.teams, 0)
+
+    def add(self, standings):
+        """Folds one finished season's table into the totals."""
+        table = standings.table()
+        for position, team in enumerate(table):
+            self.positions[team][position] += 1
+            self.total_points[team] += standings.rows[team]["points"]
+        self.titles[table[0]] += 1
+        self.seasons += 1
+
+    def title_probabilities(self):
+        """Returns each team's share of the titles won so far."""
+        return {team: self.titles[team] / max(1, self.seasons) for team in self.teams}
+
+    def mean_points(self):
+        return {team: self.total_points[team] / max(1, self.seasons) for team in self.teams}
+
+    def __repr__(self):
+        return f"SeasonSummary({self.seasons} seasons, {len(self.teams)} teams)"
+
+class League:
+    """A double round-robin league between the clubs in TEAM_NAMES."""
+    def __init__(self, teams=None, backend="objects", duration=GAME_DURATION_SECONDS,
+                 workers=None, chunk_size=8):
+        """Creates a league.
+
+        teams defaults to every club in TEAM_NAMES. duration is how many
+        simulated seconds of each match are played; workers and chunk_size
+        are passed to play_fixtures.
+        """
+        self.teams = list(TEAM_NAMES) if teams is None else list(teams)
+        if len(self.teams) < 2:
+            raise ValueError("A league needs at least two teams")
+        self.fixtures = [pair for pairs in round_robin(self.teams) for pair in pairs]
+        self.backend = backend
+        self.duration = duration
+        self.workers = workers
+        self.chunk_size = chunk_size
+
+    def _seed(self, base_seed, season, fixture):
+        """Returns the match seed for one fixture of a season.
+
+        The seed is hashed from all three values, so nearby base seeds give
+        unrelated seasons rather than shifted copies of the same matches.
+        fixture="lots" gives the seed of the season's tie-break draw.
+        """
+        return random.Random(f"{base_seed}/{season}/{fixture}").getrandbits(64)
+
+    def _play(self, jobs):
+        return play_fixtures(jobs, self.workers, self.chunk_size, self.backend, self.duration)
+
+    def play_season(self, seed=0, on_result=None):
+        """Plays one season and returns its final Standings.
+
+        on_result, if given, is called as on_result(standings, home, away,
+        home_goals, away_goals) after each result is added, so a live table
+        can be shown while the season is still being played.
+        """
+        standings = Standings(self.teams, random.Random(self._seed(seed, 0, "lots")))
+        jobs = ((i, self._seed(seed, 0, i)) for i in range(len(self.fixtures)))
+        for i, home_goals, away_goals in self._play(jobs):
+            home, away = self.fixtures[i]
+            standings.record(home, away, home_goals, away_goals)
+            if on_result is not None:
+                on_result(standings, home, away, home_goals, away_goals)
+        return standings
+
+    def simulate_seasons(self, n, seed=0, summary=None):
+        """Plays n seasons and returns a SeasonSummary of the outcomes.
+
+        The fixtures of all seasons are streamed through one worker pool.
+        Only the tables of seasons with results still outstanding are kept,
+        and as chunks are submitted in season order that is at most a
+        couple of seasons at a time. An existing summary can be passed to
+        keep adding to it.
+        """
+        summary = summary or SeasonSummary(self.teams)
+        count = len(self.fixtures)
+        open_seasons = {}
+        jobs = (((season, i), self._seed(seed, season, i))
+                for season in range(n) for i in range(count))
+        for (season, i), home_goals, away_goals in self._play(jobs):
+            standings = open_seasons.get(season)
+            if standings is None:
+                standings = open_seasons[season] = Standings(
+                    self.teams, random.Random(self._seed(seed, season, "lots")))
+            home, away = self.fixtures[i]
+            standings.record(home, away, home_goals, away_goals)
+            if standings.matches == count:
+                summary.add(open_seasons.pop(season))
+        return summary
+
+# ==============================================================================
+# SECTION 4: Main Execution
+# ==============================================================================
+
+if __name__ == "__main__":
+    league = League(duration=30)
+    print(league.play_season(seed=0))
+    summary = league.simulate_seasons(10, seed=1)
+    print(summary)
+    for team, p in sorted(summary.title_probabilities().items(), key=lambda item: -item[1]):
+        print(f"{TEAM_NAMES[team]:<14} {p:6.1%}")
@@ -0,0 +1,145 @@
+# football_recorder.py
+
+"""
+Columnar Trajectory Recorder
+============================
+
+Records the state of a running FootballGame frame by frame into preallocated,
+memory-mapped columnar files instead of printing it. Each column (time, ball
+position, player velocities, ...) is a separate ``.npy`` file in one
+directory, so a recording can be read back with ``load_trajectory`` as
+zero-copy NumPy arrays.
+
+Recording is cheap to leave wired in: a disabled recorder returns straight
+away, and ``every=k`` keeps only every k-th frame. Single precision is used
+for positions and velocities, so a full match sampled every frame comes to a
+few megabytes.
+"""
+
+import json
+import os
+
+import numpy as np
+
+from football import FPS, GAME_DURATION_SECONDS, NUM_PLAYERS_PER_TEAM
+
+# ==============================================================================
+# SECTION 1: Column Layout
+# ==============================================================================
+
+NUM_PLAYERS = 2 * NUM_PLAYERS_PER_TEAM
+
+# Column name -> (per-frame shape, dtype)
+COLUMNS = {
+    "time": ((), np.float64),
+    "ball_position": ((2,), np.float32),
+    "ball_velocity": ((2,), np.float32),
+    "player_position": ((NUM_PLAYERS, 2), np.float32),
+    "player_velocity": ((NUM_PLAYERS, 2), np.float32),
+    "score": ((2,), np.int16),
+}
+
+META_FILE = "meta.json"
+
+# ==============================================================================
+# SECTION 2: Recorder and Loader
+# ==============================================================================
+
+class TrajectoryRecorder:
+    """Appends sampled frames of a FootballGame to memory-mapped column files."""
+    def __init__(self, directory, every=1, max_frames=None, enabled=True):
+        """Creates the column files in directory.
+
+        every keeps one frame in k. max_frames is the number of rows to
+        preallocate and defaults to a full GAME_DURATION_SECONDS match.
+        Frames that arrive once the files are full are counted in
+        frames_dropped rather than recorded.
+        """
+        if every < 1:
+            raise ValueError("every must be at least 1")
+        if max_frames is None:
+            max_frames = (GAME_DURATION_SECONDS * FPS) // every + 2
+        self.directory = directory
+        self.every = every
+        self.max_frames = max_frames
+        self.enabled = enabled
+        self.frames_recorded = 0
+        self.frames_dropped = 0
+        self._tick = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._memmaps = [
+            np.lib.format.open_memmap(
+                os.path.join(directory, name + ".npy"), mode="w+",
+                dtype=dtype, shape=(max_frames,) + shape)
+            for name, (shape, dtype) in COLUMNS.items()
+        ]
+        # Plain ndarray views over the same mappings skip np.memmap's
+        # per-assignment subclass overhead in record().
+        self.columns = {
+            name: memmap.view(np.ndarray) for name, memmap in zip(COLUMNS, self._memmaps)
+        }
+
+    def record(self, game):
+        """Records the current frame of game if it falls on the sampling grid."""
+        if not self.enabled:
+            return
+        tick = self._tick
+        self._tick += 1
+        if tick % self.every:
+            return
+        row = self.frames_recorded
+        if row >= self.max_frames:
+            self.frames_dropped += 1
+            return
+
+        columns = self.columns
+        columns["time"][row] = game.timer
+        ball = game.ball
+        columns["ball_position"][row] = (ball.position.x, ball.position.y)
+        columns["ball_velocity"][row] = (ball.velocity.x, ball.velocity.y)
+        if game.pitch is not None:
+            columns["player_position"][row] = game.pitch.positions
+            columns["player_velocity"][row] = game.pitch.velocities
+        else:
+            # One bulk assignment per column is far cheaper than one per player.
+            players = game.bodies[:-1]
+            columns["player_position"][row] = [(p.position.x, p.position.y) for p in players]
+            columns["player_velocity"][row] = [(p.velocity.x, p.velocity.y) for p in players]
+        columns["score"][row] = (game.team_a.score, game.team_b.score)
+        self.frames_recorded = row + 1
+
+    def close(self):
+        """Flushes the column files and writes the recording metadata."""
+        for memmap in self._memmaps:
+            memmap.flush()
+        meta = {
+            "frames": self.frames_recorded,
+            "frames_dropped": self.frames_dropped,
+            "every": self.every,
+            "fps": FPS,
+        }
+        with open(os.path.join(self.directory, META_FILE), "w") as f:
+            json.dump(meta, f)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+def load_trajectory(directory):
+    """Opens a recording as read-only memory-mapped arrays.
+
+    Returns a dictionary of column name to array, trimmed to the frames that
+    were actually recorded, plus the recording metadata under "meta".
+    """
+    with open(os.path.join(directory, META_FILE)) as f:
+        meta = json.load(f)
+    frames = meta["frames"]
+    trajectory = {
+        name: np.load(os.path.join(directory, name + ".npy"), mmap_mode="r")[:frames]
+        for name in COLUMNS
+    }
+    trajectory["meta"] = meta
+    return trajectory